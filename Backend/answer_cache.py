@@ -0,0 +1,48 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Folds case, punctuation and whitespace so equivalent questions share a cache entry
+def normalize_query(query: str) -> str:
+    folded = PUNCTUATION_PATTERN.sub(" ", query.casefold())
+    return WHITESPACE_PATTERN.sub(" ", folded).strip()
+
+# Size-bounded LRU of chat answers with a per-entry TTL, keyed by normalized query and context version
+class AnswerCache:
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, query: str, version: Hashable) -> Optional[str]:
+        key = (normalize_query(query), version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, query: str, version: Hashable, answer: str) -> None:
+        key = (normalize_query(query), version)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,121 @@
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from event_normalizer import group_events, normalize_events, parse_location_data
+from fakes import twelve_hour
+
+COUNTIES = ['HARTFORD', 'NEW HAVEN', 'FAIRFIELD', 'LITCHFIELD', 'MIDDLESEX', 'NEW LONDON', 'TOLLAND', 'WINDHAM']
+TOWNS = ['Hartford', 'New Haven', 'Bridgeport', 'Waterbury', 'Norwich', 'Danbury', 'Torrington', 'Willimantic']
+FIRST_DAY = date(2024, 1, 6)
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+# Builds calendar events shaped like the ctfoodbank calendar export, with recurring stops sharing a description
+def build_corpus(event_count: int, site_count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    sites = []
+    for site in range(site_count):
+        hour = rng.randint(8, 15)
+        weekday = rng.choice(WEEKDAYS)
+        description = (
+            f"<b>MOBILE PANTRY</b><br><b>{twelve_hour(hour)}-{twelve_hour(hour + 1, 30)}</b><br>"
+            f"{rng.choice(COUNTIES)} COUNTY<br>Every {rng.randint(1, 4)} weeks on {weekday}<br>"
+            f"<i>Bring your own bags</i> , no ID required , site #{site}<br><a href='https://example.org/{site}'>More info</a>"
+        )
+        sites.append({
+            'summary': f"Mobile Pantry - {rng.choice(TOWNS)} {site}",
+            'location': f"{rng.randint(1, 999)} Main St, {rng.choice(TOWNS)}, CT",
+            'description': description,
+            'weekday': WEEKDAYS.index(weekday),
+            'hour': hour,
+        })
+
+    events = []
+    for index in range(event_count):
+        site = sites[index % site_count]
+        day = FIRST_DAY + timedelta(days=(site['weekday'] - FIRST_DAY.weekday()) % 7, weeks=index // site_count)
+        events.append({
+            'id': f"evt{index}",
+            'summary': site['summary'],
+            'location': site['location'],
+            'description': site['description'],
+            'start': f"{day.isoformat()}T{site['hour']:02d}:00:00-05:00",
+            'end': f"{day.isoformat()}T{site['hour'] + 1:02d}:30:00-05:00",
+        })
+    return events
+
+# The original implementation, kept here as the baseline: two parses and per-call regex compilation
+def legacy_parse_location_data(event: Dict[str, Any]) -> Dict[str, Any]:
+    time_value = ''
+    description = event.get('description', '')
+    soup = BeautifulSoup(description, 'html.parser')
+    time_pattern = re.compile(r'\d{1,2}:\d{2}[AP]M-\d{1,2}:\d{2}[AP]M')
+    for b_tag in soup.find_all('b'):
+        time_match = time_pattern.search(b_tag.text)
+        if time_match:
+            time_value = time_match.group(0)
+            break
+
+    soup = BeautifulSoup(description, 'html.parser')
+    clean_text = soup.get_text(' ', strip=True)
+    county_match = re.compile(r'([A-Z]+\s+COUNTY)').search(clean_text)
+    county = county_match.group(1) if county_match else ''
+    schedule_match = re.compile(r'Every \d+ weeks? on ([A-Za-z]+)').search(clean_text)
+    schedule = schedule_match.group(0) if schedule_match else ''
+
+    clean_description = clean_text
+    for value in (time_value, schedule, county):
+        if value:
+            clean_description = clean_description.replace(value, '').strip()
+    clean_description = re.sub(r'\s*,\s*', ', ', clean_description)
+    clean_description = re.sub(r'\s+', ' ', clean_description).strip(' ,')
+    return {'time': time_value, 'county': county, 'schedule': schedule, 'description': clean_description}
+
+def run(label: str, func, events: List[Dict[str, Any]], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(events)
+        best = min(best, time.perf_counter() - start)
+    rate = len(events) / best
+    print(f"{label:<32} {best * 1000:9.1f} ms  {rate:12,.0f} events/s")
+    return rate
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark calendar event normalization')
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--sites', type=int, default=250, help='distinct descriptions shared by recurring events')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    events = build_corpus(args.events, args.sites)
+
+    sample = events[0]
+    legacy = legacy_parse_location_data(sample)
+    current = parse_location_data(sample, 'html.parser')
+    assert all(legacy[field] == current[field] for field in legacy), (legacy, current)
+
+    print(f"{args.events} events, {args.sites} distinct descriptions")
+    run('legacy per-event (html.parser)', lambda batch: [legacy_parse_location_data(e) for e in batch], events, args.repeat)
+    parsers = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        parsers.append('lxml')
+    except ImportError:
+        print('lxml not installed; skipping the lxml backend')
+    for backend in parsers:
+        run(f"single-parse per-event ({backend})", lambda batch: [parse_location_data(e, backend) for e in batch], events, args.repeat)
+        run(f"batch normalizer ({backend})", lambda batch: normalize_events(batch, backend), events, args.repeat)
+        run(f"grouped normalizer ({backend})", lambda batch: normalize_events(group_events(batch), backend), events, args.repeat)
+    print(f"grouping collapses {len(events)} occurrences into {len(group_events(events))} location records")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+import clients
+from event_index import EVENT_TIMEZONE
+
+# In-process stand-ins for GCS, OpenAI and Google Maps so the backend can be benchmarked offline
+
+_generations = itertools.count(1)
+
+class PreconditionFailed(Exception):
+    pass
+
+class FakeBlob:
+    def __init__(self, bucket: 'FakeBucket', name: str, generation: Optional[int] = None):
+        self.bucket = bucket
+        self.name = name
+        self._generation = generation
+        self.metadata: Optional[Dict[str, str]] = None
+        self.content_type: Optional[str] = None
+
+    @property
+    def generation(self) -> Optional[int]:
+        if self._generation is not None:
+            return self._generation
+        stored = self.bucket.objects.get(self.name)
+        return stored['generation'] if stored else None
+
+    @property
+    def md5_hash(self) -> Optional[str]:
+        stored = self.bucket.objects.get(self.name)
+        return stored['md5'] if stored else None
+
+    def exists(self, client: Any = None) -> bool:
+        return self.name in self.bucket.objects
+
+    def reload(self, client: Any = None) -> None:
+        stored = self.bucket.objects.get(self.name)
+        if stored is None:
+            raise FileNotFoundError(self.name)
+        self.metadata = dict(stored['metadata'])
+
+    def download_as_bytes(self, client: Any = None) -> bytes:
+        self.bucket.delay('download')
+        with self.bucket.lock:
+            self.bucket.calls['download'] += 1
+            stored = self.bucket.objects.get(self.name)
+        if stored is None:
+            raise FileNotFoundError(self.name)
+        return stored['data']
+
+    def download_as_text(self, client: Any = None) -> str:
+        return self.download_as_bytes(client).decode('utf-8')
+
+    def upload_from_string(self, data, content_type: Optional[str] = None, if_generation_match: Optional[int] = None, client: Any = None) -> None:
+        self.bucket.delay('upload')
+        payload = data.encode('utf-8') if isinstance(data, str) else data
+        with self.bucket.lock:
+            self.bucket.calls['upload'] += 1
+            current = self.bucket.objects.get(self.name)
+            if if_generation_match is not None and (current['generation'] if current else 0) != if_generation_match:
+                raise PreconditionFailed(self.name)
+            generation = next(_generations)
+            self.bucket.objects[self.name] = {
+                'data': payload,
+                'generation': generation,
+                'md5': hashlib.md5(payload).hexdigest(),
+                'metadata': dict(self.metadata or {}),
+                'content_type': content_type,
+            }
+        self._generation = generation
+
+# Dict-backed bucket with optional per-operation latency, counting calls by kind
+class FakeBucket:
+    def __init__(self, objects: Optional[Dict[str, Any]] = None, latency: Optional[Dict[str, float]] = None):
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.latency = latency or {}
+        self.calls = {'list': 0, 'get': 0, 'download': 0, 'upload': 0}
+        self.lock = threading.Lock()
+        for name, data in (objects or {}).items():
+            self.put(name, data)
+
+    def delay(self, operation: str) -> None:
+        seconds = self.latency.get(operation, 0.0)
+        if seconds:
+            time.sleep(seconds)
+
+    def put(self, name: str, data: Any) -> None:
+        if not isinstance(data, (str, bytes)):
+            data = json.dumps(data, ensure_ascii=False)
+        blob = FakeBlob(self, name)
+        blob.upload_from_string(data)
+
+    def blob(self, name: str, generation: Optional[int] = None) -> FakeBlob:
+        return FakeBlob(self, name, generation)
+
+    def get_blob(self, name: str) -> Optional[FakeBlob]:
+        self.delay('get')
+        with self.lock:
+            self.calls['get'] += 1
+            stored = self.objects.get(name)
+        if stored is None:
+            return None
+        blob = FakeBlob(self, name, stored['generation'])
+        blob.metadata = dict(stored['metadata'])
+        return blob
+
+    def list_blobs(self, prefix: Optional[str] = None) -> List[FakeBlob]:
+        self.delay('list')
+        with self.lock:
+            self.calls['list'] += 1
+            return [
+                FakeBlob(self, name, stored['generation'])
+                for name, stored in sorted(self.objects.items())
+                if not prefix or name.startswith(prefix)
+            ]
+
+class FakeStorageClient:
+    def __init__(self, bucket: FakeBucket):
+        self._bucket = bucket
+
+    def bucket(self, name: str) -> FakeBucket:
+        return self._bucket
+
+    def get_bucket(self, name: str) -> FakeBucket:
+        return self._bucket
+
+class _Message:
+    def __init__(self, content: Optional[str]):
+        self.content = content
+
+class _Choice:
+    def __init__(self, content: Optional[str]):
+        self.message = _Message(content)
+        self.delta = _Message(content)
+
+class _Completion:
+    def __init__(self, content: Optional[str]):
+        self.choices = [_Choice(content)]
+
+# Mimics client.chat.completions.create with a fixed first-token latency and a per-token streaming rate
+class FakeCompletions:
+    def __init__(self, latency: float = 0.8, tokens_per_second: float = 60.0):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def answer(messages: List[Dict[str, str]]) -> str:
+        context = messages[-1]['content'] if messages else ''
+        lines = [line for line in context.splitlines() if line and not line.startswith('Source:')][:3]
+        if 'food bank' in (messages[1]['content'] if len(messages) > 1 else '').lower():
+            return '\n\n'.join(f"🏢 Site {i}\n📍 Address: {i} Main St, Hartford, CT\n⏰ Hours: 9:00AM-11:00AM" for i in range(1, 4))
+        return "Here is what I found:\n" + '\n'.join(f"- {line[:160]}" for line in lines)
+
+    def create(self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs: Any):
+        with self.lock:
+            self.calls += 1
+        text = self.answer(messages)
+        time.sleep(self.latency)
+        if not stream:
+            time.sleep(len(text.split()) / self.tokens_per_second)
+            return _Completion(text)
+        return self._stream(text)
+
+    def _stream(self, text: str) -> Iterator[_Completion]:
+        for word in text.split(' '):
+            time.sleep(1.0 / self.tokens_per_second)
+            yield _Completion(word + ' ')
+
+class FakeOpenAI:
+    def __init__(self, latency: float = 0.8, tokens_per_second: float = 60.0):
+        self.completions = FakeCompletions(latency, tokens_per_second)
+        self.chat = type('Chat', (), {'completions': self.completions})()
+
+# Deterministic geocoder placing every address somewhere inside Connecticut
+class FakeGeocoder:
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def geocode(self, query: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        digest = hashlib.sha256(query.encode('utf-8')).digest()
+        lat = 41.0 + digest[0] / 255 * 1.0
+        lng = -73.7 + digest[1] / 255 * 1.9
+        return [{'geometry': {'location': {'lat': round(lat, 6), 'lng': round(lng, 6)}}}]
+
+TOWNS = ['Hartford', 'New Haven', 'Bridgeport', 'Waterbury', 'Norwich', 'Danbury', 'Torrington', 'Willimantic', 'Middletown', 'Bristol', 'Meriden', 'New London']
+COUNTIES = ['HARTFORD', 'NEW HAVEN', 'FAIRFIELD', 'LITCHFIELD', 'MIDDLESEX', 'NEW LONDON', 'TOLLAND', 'WINDHAM']
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+TOPICS = {
+    'milestones.json': ['By 2 months your baby smiles at people', 'By 12 months your child pulls up to stand and walks holding on to furniture', 'By 18 months your child says several single words'],
+    'women_infants_children.json': ['WIC provides healthy foods, nutrition education and breastfeeding support', 'Families with children under 5 may qualify for WIC', 'Apply for WIC at your local WIC office'],
+    'diaper_connections.json': ['The Diaper Bank of Connecticut distributes diapers through partner agencies', 'Find a diaper pantry near you', 'Period supplies are available at select partners'],
+    'temporary_family_assistance.json': ['Temporary Family Assistance provides cash assistance to eligible families', 'Apply online through ConneCT'],
+    'birth_to_3_programs.json': ['Birth to Three supports infants and toddlers with developmental delays', 'Early intervention services are provided at home'],
+    'state_education_resource_center.json': ['SERC offers special education resources for families and teachers', 'Learn about IEP meetings and parent rights'],
+    'family_support_and_services.json': ['Parent support groups meet monthly across Connecticut', 'Respite care gives caregivers a break'],
+    'providers.json': ['ABA therapy providers accepting Medicaid', 'Developmental pediatricians offering autism evaluations'],
+    'nimh_asd.json': ['Autism spectrum disorder is a neurological and developmental disorder', 'Signs of autism include differences in communication and behavior'],
+    'cdc_autism_data.json': ['About 1 in 36 children has been identified with autism', 'Autism prevalence data by state'],
+}
+
+# Formats a 24-hour time the way the calendar descriptions do, e.g. 13, 30 -> "1:30PM"
+def twelve_hour(hour: int, minute: int = 0) -> str:
+    return f"{(hour - 1) % 12 + 1}:{minute:02d}{'AM' if hour < 12 else 'PM'}"
+
+# Food bank calendar occurrences whose description (weekday, hours, interval) agrees with their start and end times
+def calendar_events(sites: int, occurrences: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    today = datetime.now(EVENT_TIMEZONE).date()
+    events = []
+    for site in range(sites):
+        town = rng.choice(TOWNS)
+        hour = rng.randint(8, 14)
+        weekday = rng.choice(WEEKDAYS)
+        interval = rng.randint(1, 4)
+        day = today + timedelta(days=(WEEKDAYS.index(weekday) - today.weekday()) % 7)
+        first = datetime(day.year, day.month, day.day, hour, tzinfo=EVENT_TIMEZONE)
+        description = (
+            f"<b>MOBILE PANTRY</b><br><b>{twelve_hour(first.hour)}-{twelve_hour(first.hour + 1, 30)}</b><br>"
+            f"{rng.choice(COUNTIES)} COUNTY<br>Every {interval} weeks on {first.strftime('%A')}<br>"
+            f"<i>Bring your own bags</i>, no ID required<br><a href='https://example.org/{site}'>More info</a>"
+        )
+        location = f"{rng.randint(1, 999)} Main St, {town}, CT 06{rng.randint(100, 999)}"
+        for occurrence in range(occurrences):
+            start = first + timedelta(weeks=occurrence * interval)
+            events.append({
+                'id': f"evt{site}_{occurrence}",
+                'summary': f"Mobile Pantry - {town} {site}",
+                'start': start.isoformat(),
+                'end': (start + timedelta(minutes=90)).isoformat(),
+                'description': description,
+                'location': location,
+                'creator': 'ctfoodbank.events@gmail.com',
+            })
+    return events
+
+# Builds bucket contents shaped like the scrapers' outputs: the food bank calendar, JSON records and text summaries
+def seed_objects(sites: int = 200, occurrences: int = 6, records_per_topic: int = 40, seed: int = 7) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    objects: Dict[str, Any] = {'calendar_events.json': calendar_events(sites, occurrences, seed)}
+    for name, sentences in TOPICS.items():
+        records = []
+        for index in range(records_per_topic):
+            sentence = rng.choice(sentences)
+            records.append({'tag': 'p', 'content': f"{sentence}. Record {index} for {rng.choice(TOWNS)}.", 'href': f"https://example.org/{name}/{index}"})
+        objects[name] = records
+        stem = name.rsplit('.', 1)[0]
+        objects[f"Txt files/{stem}.txt"] = '\n\n'.join(f"{sentence}." for sentence in sentences)
+    return objects
+
+# Points the backend's shared clients at fresh fakes and returns them for inspection
+def install(openai_latency: float = 0.8, tokens_per_second: float = 60.0, geocode_latency: float = 0.05, gcs_latency: float = 0.0, **seed_options: Any) -> Dict[str, Any]:
+    latency = {operation: gcs_latency for operation in ('list', 'get', 'download', 'upload')}
+    bucket = FakeBucket(seed_objects(**seed_options), latency)
+    fakes = {
+        'bucket': bucket,
+        'storage': FakeStorageClient(bucket),
+        'openai': FakeOpenAI(openai_latency, tokens_per_second),
+        'gmaps': FakeGeocoder(geocode_latency),
+    }
+    for name, client in fakes.items():
+        clients.set_client(name, client)
+    return fakes
@@ -0,0 +1,185 @@
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('WARMUP_ON_START', '0')
+os.environ.setdefault('VECTOR_INDEX_PATH', '')
+
+import fakes
+
+CHAT_QUERIES = [
+    "Are there any food banks in Connecticut that are open in the next week?",
+    "Can you provide some basic information about autism spectrum disorder?",
+    "What support groups are available for parents of autistic children in Connecticut?",
+    "What educational resources are available for autistic children in Connecticut?",
+    "Food pantries in Hartford County tomorrow",
+    "What's open Saturday morning?",
+    "Where can I get free diapers?",
+    "How do I apply for WIC?",
+    "When should my baby start walking?",
+    "What are the early signs of autism in toddlers?",
+]
+
+# (label, method, path, JSON body factory) for each request kind the generator can issue
+def scenarios(rng: random.Random) -> Dict[str, Callable[[], Tuple[str, str, Optional[Dict[str, Any]]]]]:
+    return {
+        'chat': lambda: ('POST', '/chat', {'query': rng.choice(CHAT_QUERIES)}),
+        'chat_stream': lambda: ('POST', '/chat/stream', {'query': rng.choice(CHAT_QUERIES)}),
+        'resources': lambda: ('GET', '/api/resources', None),
+        'viewport': lambda: ('GET', f"/api/resources?bbox=41.5,-73.0,41.9,-72.4&zoom={rng.randint(8, 14)}", None),
+        'nearby': lambda: ('GET', f"/api/resources/nearby?lat={41.0 + rng.random():.4f}&lng={-73.7 + rng.random() * 1.9:.4f}&k=5", None),
+    }
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class InProcessTransport:
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def request(self, method: str, path: str, body: Optional[Dict[str, Any]]) -> int:
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body, headers={'Accept-Encoding': 'gzip'})
+        response.get_data()
+        return response.status_code
+
+class HttpTransport:
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method: str, path: str, body: Optional[Dict[str, Any]]) -> int:
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method, headers={'Content-Type': 'application/json', 'Accept-Encoding': 'gzip'})
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+# Runs `concurrency` workers issuing a weighted mix of requests until the duration elapses
+def run_load(transport, mix: Dict[str, float], concurrency: int, duration: float, seed: int) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(worker_id: int) -> None:
+        rng = random.Random(seed + worker_id)
+        kinds = scenarios(rng)
+        labels, weights = zip(*mix.items())
+        while time.perf_counter() < deadline:
+            label = rng.choices(labels, weights)[0]
+            method, path, body = kinds[label]()
+            start = time.perf_counter()
+            try:
+                status = transport.request(method, path, body)
+            except Exception:
+                status = 599
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[label].append(elapsed)
+                if status >= 400:
+                    errors[label] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(worker_id,), daemon=True) for worker_id in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - started
+
+def report(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> None:
+    print(f"{'endpoint':<12} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    everything: List[float] = []
+    for label in sorted(latencies):
+        values = sorted(latencies[label])
+        everything.extend(values)
+        print(
+            f"{label:<12} {len(values):>8} {errors.get(label, 0):>6} {len(values) / elapsed:>8.1f} "
+            f"{percentile(values, 0.50) * 1000:>9.1f} {percentile(values, 0.95) * 1000:>9.1f} "
+            f"{percentile(values, 0.99) * 1000:>9.1f} {values[-1] * 1000:>9.1f}"
+        )
+    everything.sort()
+    print(
+        f"{'total':<12} {len(everything):>8} {sum(errors.values()):>6} {len(everything) / elapsed:>8.1f} "
+        f"{percentile(everything, 0.50) * 1000:>9.1f} {percentile(everything, 0.95) * 1000:>9.1f} "
+        f"{percentile(everything, 0.99) * 1000:>9.1f} {(everything[-1] if everything else 0) * 1000:>9.1f}"
+    )
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(','):
+        label, _, weight = part.partition('=')
+        mix[label.strip()] = float(weight or 1)
+    return mix
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Offline load test for the backend against in-process fakes')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of load after warmup')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('chat=3,chat_stream=1,resources=3,viewport=2,nearby=1'), help='weighted request kinds, e.g. chat=3,resources=1')
+    parser.add_argument('--openai-latency', type=float, default=0.8, help='seconds before the fake model answers')
+    parser.add_argument('--tokens-per-second', type=float, default=60.0)
+    parser.add_argument('--geocode-latency', type=float, default=0.05)
+    parser.add_argument('--gcs-latency', type=float, default=0.02, help='seconds per fake bucket operation')
+    parser.add_argument('--sites', type=int, default=200, help='distinct food bank sites in the fake calendar')
+    parser.add_argument('--occurrences', type=int, default=6, help='calendar instances per site')
+    parser.add_argument('--url', help='drive a running server instead of the in-process app (fakes are not installed)')
+    parser.add_argument('--no-warmup', action='store_true', help='measure cold caches instead of warming first')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    unknown = set(args.mix) - set(scenarios(random.Random()))
+    if unknown:
+        parser.error(f"unknown request kinds: {', '.join(sorted(unknown))}")
+
+    if args.url:
+        transport = HttpTransport(args.url)
+        installed = None
+    else:
+        installed = fakes.install(
+            openai_latency=args.openai_latency,
+            tokens_per_second=args.tokens_per_second,
+            geocode_latency=args.geocode_latency,
+            gcs_latency=args.gcs_latency,
+            sites=args.sites,
+            occurrences=args.occurrences,
+        )
+        import main as backend
+        if not args.no_warmup:
+            start = time.perf_counter()
+            backend.warmup.run()
+            print(f"warmup: {time.perf_counter() - start:.2f}s {json.dumps(backend.warmup.report()['steps'])}")
+        transport = InProcessTransport(backend.app)
+
+    print(f"{args.concurrency} workers for {args.duration:.0f}s, mix {args.mix}")
+    latencies, errors, elapsed = run_load(transport, args.mix, args.concurrency, args.duration, args.seed)
+    report(latencies, errors, elapsed)
+
+    if installed:
+        bucket = installed['bucket']
+        print(
+            f"fake calls: openai={installed['openai'].completions.calls} geocode={installed['gmaps'].calls} "
+            f"gcs list={bucket.calls['list']} get={bucket.calls['get']} download={bucket.calls['download']} upload={bucket.calls['upload']}"
+        )
+
+if __name__ == '__main__':
+    main()
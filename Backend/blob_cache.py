@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from clients import get_bucket
+from metrics import timed
+
+# Parsed blob contents keyed by blob name and generation, revalidated with a metadata check
+class BlobCache:
+    def __init__(self, bucket_provider: Callable[[], Any], max_entries: int = 32, max_age: float = 30.0):
+        self.bucket_provider = bucket_provider
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str, int], Any]" = OrderedDict()
+        self._generations: Dict[str, Tuple[Optional[int], float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def bucket(self):
+        return self.bucket_provider()
+
+    # Records a generation already known from a listing so no extra metadata call is needed
+    def observe(self, name: str, generation: Optional[int]) -> None:
+        with self._lock:
+            self._generations[name] = (generation, time.monotonic())
+
+    # Returns the current generation of a blob, or None if it does not exist
+    def get_generation(self, name: str) -> Optional[int]:
+        with self._lock:
+            known = self._generations.get(name)
+        if known and time.monotonic() - known[1] < self.max_age:
+            return known[0]
+
+        with timed('gcs_metadata'):
+            blob = self.bucket.get_blob(name)
+        generation = blob.generation if blob else None
+        self.observe(name, generation)
+        return generation
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                self._generations.clear()
+                return
+            self._generations.pop(name, None)
+            for key in [key for key in self._entries if key[1] == name]:
+                del self._entries[key]
+
+    def _get(self, kind: str, name: str, parse: Callable[[str], Any], generation: Optional[int]) -> Any:
+        if generation is None:
+            generation = self.get_generation(name)
+            if generation is None:
+                return None
+
+        key = (kind, name, generation)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        with timed('gcs_download'):
+            text = self.bucket.blob(name, generation=generation).download_as_text()
+        value = parse(text)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_text(self, name: str, generation: Optional[int] = None) -> Optional[str]:
+        return self._get('text', name, lambda text: text, generation)
+
+    def get_json(self, name: str, generation: Optional[int] = None) -> Any:
+        return self._get('json', name, json.loads, generation)
+
+
+blob_cache = BlobCache(
+    get_bucket,
+    max_entries=int(os.environ.get('BLOB_CACHE_MAX_ENTRIES', 32)),
+    max_age=float(os.environ.get('BLOB_CACHE_MAX_AGE', 30)),
+)
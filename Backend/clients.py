@@ -0,0 +1,45 @@
+import os
+import threading
+from typing import Any, Callable, Dict
+
+BUCKET_NAME = 'beacon-database'
+
+_clients: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+# Creates a client on first use and shares it across modules and threads
+def _get_or_create(name: str, factory: Callable[[], Any]) -> Any:
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = factory()
+    return client
+
+# Replaces a shared client, e.g. with an in-process stand-in
+def set_client(name: str, client: Any) -> None:
+    with _lock:
+        _clients[name] = client
+
+def get_storage_client():
+    def factory():
+        from google.cloud import storage
+        return storage.Client()
+    return _get_or_create('storage', factory)
+
+# Returns a bucket handle without the get_bucket metadata RPC; the first blob operation does the network work
+def get_bucket():
+    return _get_or_create('bucket', lambda: get_storage_client().bucket(BUCKET_NAME))
+
+def get_openai_client():
+    def factory():
+        from openai import OpenAI
+        return OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    return _get_or_create('openai', factory)
+
+def get_gmaps_client():
+    def factory():
+        from googlemaps import Client
+        return Client(key=os.environ.get('GOOGLE_MAPS_API_KEY'))
+    return _get_or_create('gmaps', factory)
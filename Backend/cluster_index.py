@@ -0,0 +1,84 @@
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Hierarchical grid of pre-aggregated clusters, one level per map zoom, built once per data version
+class ClusterIndex:
+    def __init__(self, resources: Iterable[Dict[str, Any]], max_zoom: int = 12, cells_per_tile: int = 4):
+        self.max_zoom = max_zoom
+        self.cells_per_tile = cells_per_tile
+        self.points: Dict[Tuple[int, int], List[Dict[str, Any]]] = defaultdict(list)
+        self.levels: List[Dict[Tuple[int, int], List[Any]]] = [dict() for _ in range(max_zoom + 1)]
+
+        for resource in resources:
+            if resource.get('lat') is None or resource.get('lng') is None:
+                continue
+            self.points[self._cell(resource['lat'], resource['lng'], max_zoom)].append(resource)
+
+        # Aggregate [count, lat_sum, lng_sum, only_resource] at the finest level, then fold each level into its parent
+        finest = self.levels[max_zoom]
+        for cell, resources_in_cell in self.points.items():
+            finest[cell] = [
+                len(resources_in_cell),
+                sum(resource['lat'] for resource in resources_in_cell),
+                sum(resource['lng'] for resource in resources_in_cell),
+                resources_in_cell[0] if len(resources_in_cell) == 1 else None,
+            ]
+        for zoom in range(max_zoom, 0, -1):
+            parent = self.levels[zoom - 1]
+            for (row, col), (count, lat_sum, lng_sum, only_resource) in self.levels[zoom].items():
+                totals = parent.get((row >> 1, col >> 1))
+                if totals is None:
+                    parent[(row >> 1, col >> 1)] = [count, lat_sum, lng_sum, only_resource]
+                    continue
+                totals[0] += count
+                totals[1] += lat_sum
+                totals[2] += lng_sum
+                totals[3] = None
+
+    def cell_size(self, zoom: int) -> float:
+        return 360.0 / (2 ** zoom) / self.cells_per_tile
+
+    def _cell(self, lat: float, lng: float, zoom: int) -> Tuple[int, int]:
+        size = self.cell_size(zoom)
+        return (math.floor((lat + 90.0) / size), math.floor((lng + 180.0) / size))
+
+    def _cells_in_bbox(self, level: Dict[Tuple[int, int], Any], bbox: Tuple[float, float, float, float], zoom: int) -> Iterable[Tuple[int, int]]:
+        south, west, north, east = bbox
+        min_row, min_col = self._cell(south, west, zoom)
+        max_row, max_col = self._cell(north, east, zoom)
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > len(level):
+            return [cell for cell in level if min_row <= cell[0] <= max_row and min_col <= cell[1] <= max_col]
+        return [
+            (row, col)
+            for row in range(min_row, max_row + 1)
+            for col in range(min_col, max_col + 1)
+            if (row, col) in level
+        ]
+
+    # Returns individual resources inside the bounding box (south, west, north, east)
+    def points_in_bbox(self, bbox: Tuple[float, float, float, float]) -> List[Dict[str, Any]]:
+        south, west, north, east = bbox
+        return [
+            resource
+            for cell in self._cells_in_bbox(self.points, bbox, self.max_zoom)
+            for resource in self.points[cell]
+            if south <= resource['lat'] <= north and west <= resource['lng'] <= east
+        ]
+
+    # Returns (clusters, points) for a viewport; single-resource cells come back as points so they render as markers
+    def query(self, bbox: Tuple[float, float, float, float], zoom: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        if zoom > self.max_zoom:
+            return [], self.points_in_bbox(bbox)
+
+        zoom = max(0, zoom)
+        level = self.levels[zoom]
+        clusters = []
+        points = []
+        for cell in self._cells_in_bbox(level, bbox, zoom):
+            count, lat_sum, lng_sum, only_resource = level[cell]
+            if only_resource is not None:
+                points.append(only_resource)
+            else:
+                clusters.append({'lat': lat_sum / count, 'lng': lng_sum / count, 'count': count})
+        return clusters, points
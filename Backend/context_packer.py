@@ -0,0 +1,92 @@
+import re
+import json
+from typing import Any, Dict, Iterable, List
+
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+APPROX_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+# Keys that carry markup or bookkeeping rather than facts worth spending prompt tokens on
+SKIPPED_KEYS = frozenset(['tag', 'id', 'creator'])
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding('cl100k_base')
+except Exception:
+    _encoding = None
+
+# Counts tokens with the model's tokenizer when tiktoken is installed, otherwise approximates by words and punctuation
+def count_tokens(text: str) -> int:
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return len(APPROX_TOKEN_PATTERN.findall(text))
+
+def clean_text(value: Any) -> str:
+    return WHITESPACE_PATTERN.sub(' ', HTML_TAG_PATTERN.sub(' ', str(value))).strip()
+
+# Flattens scraper JSON into compact "key: value" lines, one line per record
+def json_to_lines(value: Any) -> List[str]:
+    if isinstance(value, dict):
+        lines = []
+        fields = []
+        for key, item in value.items():
+            if key in SKIPPED_KEYS or item in (None, '', [], {}):
+                continue
+            if isinstance(item, (dict, list)):
+                lines.extend(json_to_lines(item))
+            else:
+                fields.append(f"{key}: {clean_text(item)}")
+        return (['; '.join(fields)] if fields else []) + lines
+    if isinstance(value, list):
+        lines = []
+        for item in value:
+            lines.extend(json_to_lines(item))
+        return lines
+    text = clean_text(value)
+    return [text] if text else []
+
+def text_to_lines(text: str) -> List[str]:
+    lines = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = clean_text(paragraph)
+        if paragraph:
+            lines.extend(SENTENCE_PATTERN.split(paragraph) if count_tokens(paragraph) > 200 else [paragraph])
+    return lines
+
+# Groups consecutive lines into passages of roughly max_tokens tokens
+def chunk_lines(source: str, lines: Iterable[str], max_tokens: int = 200) -> List[Dict[str, Any]]:
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+    for line in lines:
+        line_tokens = count_tokens(line)
+        if current and current_tokens + line_tokens > max_tokens:
+            chunks.append({'source': source, 'text': '\n'.join(current), 'tokens': current_tokens})
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += line_tokens
+    if current:
+        chunks.append({'source': source, 'text': '\n'.join(current), 'tokens': current_tokens})
+    return chunks
+
+# Splits one blob's contents into compact passages ready for ranking
+def chunk_document(name: str, content: str, max_tokens: int = 200) -> List[Dict[str, Any]]:
+    if name.endswith('.json'):
+        lines = json_to_lines(json.loads(content))
+    else:
+        lines = text_to_lines(content)
+    return chunk_lines(name, lines, max_tokens)
+
+# Packs the best-ranked chunks into a token budget, grouping passages by their source
+def pack_chunks(chunks: Iterable[Dict[str, Any]], token_budget: int) -> str:
+    selected: Dict[str, List[str]] = {}
+    used = 0
+    for chunk in chunks:
+        header_tokens = 0 if chunk['source'] in selected else count_tokens(f"Source: {chunk['source']}") + 1
+        cost = chunk['tokens'] + header_tokens + 1
+        if used + cost > token_budget:
+            continue
+        selected.setdefault(chunk['source'], []).append(chunk['text'])
+        used += cost
+    return '\n\n'.join(f"Source: {source}\n" + '\n'.join(texts) for source, texts in selected.items())
@@ -0,0 +1,101 @@
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# Calendar all-day events and naive query bounds are interpreted in the food bank's local time
+EVENT_TIMEZONE = ZoneInfo(os.environ.get('EVENT_TIMEZONE', 'America/New_York'))
+
+# Parses a calendar dateTime ("2024-05-01T10:00:00-04:00") or all-day date ("2024-05-01") into an aware datetime
+def parse_event_time(value: Any) -> Optional[datetime]:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=EVENT_TIMEZONE)
+    return parsed
+
+def normalize_county(county: Optional[str]) -> str:
+    county = ' '.join((county or '').upper().split())
+    if county and not county.endswith(' COUNTY'):
+        county = f"{county} COUNTY"
+    return county
+
+class _Timeline:
+    def __init__(self, entries: List[Tuple[float, float, Dict[str, Any]]]):
+        entries.sort(key=lambda entry: entry[0])
+        self.starts = [start for start, _, _ in entries]
+        self.ends = [end for _, end, _ in entries]
+        self.resources = [resource for _, _, resource in entries]
+        self.max_duration = max((end - start for start, end, _ in entries), default=0.0)
+
+    # Occurrences overlapping [window_start, window_end]; only starts within max_duration of the window can overlap it
+    def overlapping(self, window_start: float, window_end: float) -> List[Tuple[float, Dict[str, Any]]]:
+        low = bisect_left(self.starts, window_start - self.max_duration)
+        high = bisect_right(self.starts, window_end)
+        return [(self.starts[i], self.resources[i]) for i in range(low, high) if self.ends[i] >= window_start]
+
+# Start-sorted interval index over every occurrence of every resource, partitioned by county, answering time-window queries by binary search
+class EventIndex:
+    def __init__(self, resources: Iterable[Dict[str, Any]]):
+        entries: List[Tuple[float, float, Dict[str, Any]]] = []
+        by_county: Dict[str, List[Tuple[float, float, Dict[str, Any]]]] = {}
+        for resource in resources:
+            county = normalize_county(resource.get('county'))
+            for occurrence in resource.get('occurrences') or [resource]:
+                start = parse_event_time(occurrence.get('start'))
+                if start is None:
+                    continue
+                end = parse_event_time(occurrence.get('end')) or start
+                entry = (start.timestamp(), max(start, end).timestamp(), resource)
+                entries.append(entry)
+                if county:
+                    by_county.setdefault(county, []).append(entry)
+
+        self.all = _Timeline(entries)
+        self.by_county = {county: _Timeline(county_entries) for county, county_entries in by_county.items()}
+
+    def __len__(self) -> int:
+        return len(self.all.starts)
+
+    # Returns (first matching occurrence start, resource) pairs for resources open during the window, ordered by start
+    def occurrences_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None, county: Optional[str] = None) -> List[Tuple[datetime, Dict[str, Any]]]:
+        timeline = self.all
+        if county:
+            timeline = self.by_county.get(normalize_county(county))
+            if timeline is None:
+                return []
+        window_start = start.timestamp() if start else float('-inf')
+        window_end = end.timestamp() if end else float('inf')
+        if window_end < window_start:
+            return []
+
+        matches: Dict[int, Tuple[datetime, Dict[str, Any]]] = {}
+        for occurrence_start, resource in timeline.overlapping(window_start, window_end):
+            if id(resource) not in matches:
+                matches[id(resource)] = (datetime.fromtimestamp(occurrence_start, EVENT_TIMEZONE), resource)
+        return list(matches.values())
+
+    # Returns resources with an occurrence overlapping the window; open bounds are unbounded
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None, county: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [resource for _, resource in self.occurrences_between(start, end, county)]
+
+    # Returns resources open at any point in the next `days` days from `now`
+    def upcoming(self, days: float, now: Optional[datetime] = None, county: Optional[str] = None) -> List[Dict[str, Any]]:
+        now = now or datetime.now(timezone.utc)
+        return self.between(now, now + timedelta(days=days), county)
+
+# Parses a query bound; a bare date covers the whole day so "to=2024-05-03" includes events on the 3rd
+def parse_window_bound(value: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
+    if not value:
+        return None
+    parsed = parse_event_time(value)
+    if parsed is None:
+        raise ValueError(f"Invalid date: {value}")
+    if end_of_day and 'T' not in value and ':' not in value:
+        parsed += timedelta(days=1) - timedelta(microseconds=1)
+    return parsed
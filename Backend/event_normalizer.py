@@ -0,0 +1,136 @@
+import os
+import re
+from typing import Any, Dict, Iterable, List
+from bs4 import BeautifulSoup
+from schedule_index import parse_recurrence
+
+TIME_PATTERN = re.compile(r'\d{1,2}:\d{2}[AP]M-\d{1,2}:\d{2}[AP]M')
+COUNTY_PATTERN = re.compile(r'([A-Z]+\s+COUNTY)')
+SCHEDULE_PATTERN = re.compile(r'Every \d+ weeks? on ([A-Za-z]+)')
+COMMA_PATTERN = re.compile(r'\s*,\s*')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Uses html.parser unless EVENT_HTML_PARSER names another backend; on these short description fragments
+# lxml's per-document setup makes it slower, as benchmarks/bench_event_normalizer.py shows
+def default_parser() -> str:
+    return os.environ.get('EVENT_HTML_PARSER') or 'html.parser'
+
+HTML_PARSER = default_parser()
+
+# Extracts time, county, schedule, recurrence rule and cleaned text from a calendar event description in one parse
+def normalize_description(description: str, parser: str = HTML_PARSER) -> Dict[str, Any]:
+    if not description:
+        return {'time': '', 'county': '', 'schedule': '', 'recurrence': None, 'description': ''}
+
+    soup = BeautifulSoup(description, parser)
+
+    time = ''
+    for b_tag in soup.find_all('b'):
+        time_match = TIME_PATTERN.search(b_tag.get_text())
+        if time_match:
+            time = time_match.group(0)
+            break
+
+    clean_text = soup.get_text(' ', strip=True)
+
+    county_match = COUNTY_PATTERN.search(clean_text)
+    county = county_match.group(1) if county_match else ''
+
+    schedule_match = SCHEDULE_PATTERN.search(clean_text)
+    schedule = schedule_match.group(0) if schedule_match else ''
+
+    clean_description = clean_text
+    if time:
+        clean_description = clean_description.replace(time, '').strip()
+    if schedule:
+        clean_description = clean_description.replace(schedule, '').strip()
+    if county:
+        clean_description = clean_description.replace(county, '').strip()
+
+    clean_description = COMMA_PATTERN.sub(', ', clean_description)
+    clean_description = WHITESPACE_PATTERN.sub(' ', clean_description)
+    clean_description = clean_description.strip(' ,')
+
+    return {
+        'time': time,
+        'county': county,
+        'schedule': schedule,
+        'recurrence': parse_recurrence(schedule, time),
+        'description': clean_description
+    }
+
+# Extracts location data from an event dictionary
+def parse_location_data(event: Dict[str, Any], parser: str = HTML_PARSER) -> Dict[str, Any]:
+    if not event:
+        return {}
+    return build_location(event, normalize_description(event.get('description', ''), parser))
+
+def build_location(event: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, Any]:
+    coordinates = {}
+    if 'lat' in event and 'lng' in event:
+        coordinates = {
+            'lat': float(event['lat']),
+            'lng': float(event['lng'])
+        }
+
+    return {
+        'id': event.get('id'),
+        'name': event.get('summary', '').strip(),
+        'address': event.get('location', '').strip(),
+        'time': fields['time'],
+        'county': fields['county'],
+        'description': fields['description'],
+        'schedule': fields['schedule'],
+        'recurrence': fields['recurrence'],
+        'start': event.get('start', ''),
+        'end': event.get('end', ''),
+        'occurrences': event.get('occurrences') or (
+            [{'start': event['start'], 'end': event.get('end', '')}] if event.get('start') else []
+        ),
+        'lat': coordinates.get('lat'),
+        'lng': coordinates.get('lng')
+    }
+
+def group_key_part(value: str) -> str:
+    return WHITESPACE_PATTERN.sub(' ', value or '').strip().lower()
+
+# Merges per-occurrence calendar instances of the same site into one event with a sorted occurrence list.
+# The description carries the time and schedule, so different schedules at one site stay separate events.
+def group_events(events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for event in events:
+        if not isinstance(event, dict) or not event:
+            continue
+        key = (
+            group_key_part(event.get('summary', '')),
+            group_key_part(event.get('location', '')),
+            group_key_part(event.get('description', '')),
+        )
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {**event, 'occurrences': []}
+        if event.get('start'):
+            group['occurrences'].append({'start': event['start'], 'end': event.get('end', '')})
+
+    grouped = []
+    for group in groups.values():
+        occurrences = group['occurrences']
+        occurrences.sort(key=lambda occurrence: occurrence['start'])
+        if occurrences:
+            group['start'], group['end'] = occurrences[0]['start'], occurrences[0]['end']
+        grouped.append(group)
+    return grouped
+
+# Normalizes a batch of events, parsing each distinct description only once
+def normalize_events(events: Iterable[Dict[str, Any]], parser: str = HTML_PARSER) -> List[Dict[str, Any]]:
+    parsed: Dict[str, Dict[str, Any]] = {}
+    locations = []
+    for event in events:
+        if not isinstance(event, dict) or not event:
+            continue
+        description = event.get('description', '')
+        fields = parsed.get(description)
+        if fields is None:
+            fields = parsed[description] = normalize_description(description, parser)
+        locations.append(build_location(event, fields))
+    return locations
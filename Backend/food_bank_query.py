@@ -0,0 +1,104 @@
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from event_index import EVENT_TIMEZONE, normalize_county
+from schedule_index import weekday_index
+
+# Only explicit food bank phrasing counts; bare "food", "meals" or "groceries" also appear in questions about diets or WIC,
+# and a bare "pantry" in questions about diaper or period supply pantries
+FOOD_PATTERN = re.compile(r'\b(food\s+(?:banks?|pantr(?:y|ies)|distributions?)|mobile\s+(?:food\s+)?pantr(?:y|ies))\b', re.IGNORECASE)
+LOOKUP_PATTERN = re.compile(r'\b(where|which|list|find|any|open|locations?|sites?|schedule|hours|when)\b', re.IGNORECASE)
+WINDOW_PATTERN = re.compile(r'\b(?:(?:next|coming|upcoming)\s+(?:(?P<days>\d+)\s+days?|(?P<week>week))|(?P<this_week>this week)|(?P<today>today|tonight)|(?P<tomorrow>tomorrow))\b', re.IGNORECASE)
+WEEKDAY_PATTERN = re.compile(r'\b(mon|tues?|wed(?:nes)?|thu(?:rs?)?|fri|sat(?:ur)?|sun)(?:day)?s?\b', re.IGNORECASE)
+DAYPART_PATTERN = re.compile(r'\b(morning|afternoon|evening|night)\b|\bat (\d{1,2})(?::\d{2})?\s*([ap])\.?m\b', re.IGNORECASE)
+COUNTY_PATTERN = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+[Cc]ounty\b')
+STATE_PATTERN = re.compile(r'^(CT|Connecticut)\b', re.IGNORECASE)
+DAYPART_HOURS = {'morning': (6, 12), 'afternoon': (12, 17), 'evening': (17, 21), 'night': (17, 24)}
+
+# Returns the town in a "street, town, CT zip" address
+def address_town(address: str) -> Optional[str]:
+    parts = [part.strip() for part in (address or '').split(',')]
+    for index, part in enumerate(parts):
+        if index and STATE_PATTERN.match(part):
+            return parts[index - 1] or None
+    return None
+
+def alternation(names: Iterable[str]) -> Optional[re.Pattern]:
+    names = sorted({name for name in names if name}, key=len, reverse=True)
+    if not names:
+        return None
+    return re.compile(r'\b(' + '|'.join(re.escape(name) for name in names) + r')\b', re.IGNORECASE)
+
+# Towns and counties present in the current resources, so filters are only extracted for places we have data for
+class FoodBankDirectory:
+    def __init__(self, resources: Iterable[Dict[str, Any]]):
+        self.by_town: Dict[str, List[Dict[str, Any]]] = {}
+        counties = set()
+        for resource in resources:
+            town = address_town(resource.get('address', ''))
+            if town:
+                self.by_town.setdefault(town.lower(), []).append(resource)
+            county = normalize_county(resource.get('county'))
+            if county:
+                counties.add(county[:-len(' COUNTY')].title())
+
+        self.town_pattern = alternation(town.title() for town in self.by_town)
+        self.county_pattern = re.compile(r'\b(' + '|'.join(re.escape(county) for county in sorted(counties, key=len, reverse=True)) + r')\s+county\b', re.IGNORECASE) if counties else None
+
+    def in_town(self, town: str) -> List[Dict[str, Any]]:
+        return self.by_town.get(town.lower(), [])
+
+# Converts "today", "tomorrow", "this week", "next week" or "next N days" into a local time window
+def query_time_window(user_input: str, now: Optional[datetime] = None) -> Optional[Tuple[datetime, datetime]]:
+    match = WINDOW_PATTERN.search(user_input)
+    if not match:
+        return None
+    now = (now or datetime.now(EVENT_TIMEZONE)).astimezone(EVENT_TIMEZONE)
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if match.group('today'):
+        return now, midnight + timedelta(days=1)
+    if match.group('tomorrow'):
+        return midnight + timedelta(days=1), midnight + timedelta(days=2)
+    if match.group('this_week'):
+        return now, midnight + timedelta(days=7 - midnight.weekday())
+    days = int(match.group('days')) if match.group('days') else 7
+    return now, now + timedelta(days=days)
+
+def query_hours(user_input: str) -> Tuple[int, int]:
+    match = DAYPART_PATTERN.search(user_input)
+    if not match:
+        return 0, 24
+    if match.group(1):
+        return DAYPART_HOURS[match.group(1).lower()]
+    hour = int(match.group(2)) % 12 + (12 if match.group(3).lower() == 'p' else 0)
+    return hour, hour + 1
+
+# Extracts town, county, date window and weekday/hour filters from a food bank lookup; None when it is not one
+def parse_food_bank_query(user_input: str, directory: FoodBankDirectory, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    remaining = user_input
+    county = None
+    # Unknown counties are still extracted so the answer says nothing is scheduled there instead of asking the model
+    match = (directory.county_pattern.search(remaining) if directory.county_pattern else None) or COUNTY_PATTERN.search(remaining)
+    if match:
+        county = normalize_county(match.group(1))
+        remaining = remaining[:match.start()] + remaining[match.end():]
+
+    town = None
+    if directory.town_pattern:
+        match = directory.town_pattern.search(remaining)
+        if match:
+            town = match.group(1)
+
+    weekday_match = WEEKDAY_PATTERN.search(user_input)
+    query = {
+        'town': town,
+        'county': county,
+        'window': query_time_window(user_input, now),
+        'weekday': weekday_index(weekday_match.group(1)) if weekday_match else None,
+        'hours': query_hours(user_input),
+    }
+
+    if not FOOD_PATTERN.search(user_input):
+        return None
+    has_filter = any(query[name] is not None for name in ('town', 'county', 'window', 'weekday'))
+    return query if has_filter or LOOKUP_PATTERN.search(user_input) else None
@@ -1,32 +1,157 @@
 import os
+import re
 import json
-from typing import Optional, Dict
-from google.cloud import storage
+import time
+import atexit
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Dict, Iterable
+from clients import get_bucket, get_gmaps_client
+from metrics import timed
 
-GOOGLE_MAPS_API_KEY = os.environ.get('GOOGLE_MAPS_API_KEY')
-BUCKET_NAME = 'beacon-database'
+GEOCODE_STORE_BLOB = 'geocoding/geocode_store.json'
+GEOCODE_MAX_WORKERS = int(os.environ.get('GEOCODE_MAX_WORKERS', 8))
+GEOCODE_RATE_LIMIT = float(os.environ.get('GEOCODE_RATE_LIMIT', 40))
 
-storage_client = storage.Client()
-bucket = storage_client.get_bucket(BUCKET_NAME)
+# Normalizes an address so formatting differences map to the same store entry
+def normalize_address(address: str) -> str:
+    return re.sub(r'\s+', ' ', address).strip().lower()
 
-def geocode_address(address: str) -> Optional[Dict[str, float]]:
-    try:
-        
-        blob_name = f"geocoding/{address}.json"
-        
-        # Check if the blob exists in the storage bucket
-        if storage.Blob(bucket=bucket, name=blob_name).exists(storage_client):
-            blob = bucket.blob(blob_name)
-            coordinates = json.loads(blob.download_as_text())
-            return coordinates
+# Consolidated address to coordinates map held in memory and persisted as a single blob
+class GeocodeStore:
+    def __init__(self, bucket_provider: Callable[[], Any], blob_name: str, flush_batch_size: int = 25, flush_interval: float = 30.0):
+        self.bucket_provider = bucket_provider
+        self.blob_name = blob_name
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval = flush_interval
+        self.coordinates: Dict[str, Dict[str, float]] = {}
+        self.pending: Dict[str, Dict[str, float]] = {}
+        self.generation = 0
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+
+    @property
+    def bucket(self):
+        return self.bucket_provider()
+
+    # Reads the whole store in one download, merging it under any unflushed entries.
+    # An empty store is seeded from the legacy per-address blobs under the same prefix on the first load.
+    def load(self) -> None:
+        with self._lock:
+            blob = self.bucket.get_blob(self.blob_name)
+            stored = json.loads(blob.download_as_text()) if blob else {}
+            self.generation = blob.generation if blob else 0
+            migrate = not stored and not self.loaded
+            if migrate:
+                self.pending = {**self.read_legacy(), **self.pending}
+            self.coordinates = {**stored, **self.pending}
+            self.loaded = True
+            if migrate and self.pending:
+                self.flush()
+
+    # Collects the legacy geocoding/<address>.json blobs in one listing
+    def read_legacy(self) -> Dict[str, Dict[str, float]]:
+        prefix = self.blob_name.rsplit('/', 1)[0] + '/'
+        legacy = {}
+        try:
+            for blob in self.bucket.list_blobs(prefix=prefix):
+                if blob.name == self.blob_name or not blob.name.endswith('.json'):
+                    continue
+                coordinates = json.loads(blob.download_as_text())
+                if coordinates:
+                    legacy[normalize_address(blob.name[len(prefix):-len('.json')])] = coordinates
+        except Exception as e:
+            print(f"Error reading legacy geocoding blobs: {e}")
+        if legacy:
+            print(f"Migrating {len(legacy)} legacy geocoding blobs into {self.blob_name}")
+        return legacy
+
+    def get(self, address: str) -> Optional[Dict[str, float]]:
+        if not self.loaded:
+            self.load()
+        coordinates = self.coordinates.get(normalize_address(address))
+        if coordinates:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return coordinates
+
+    def put(self, address: str, coordinates: Dict[str, float]) -> None:
+        key = normalize_address(address)
+        with self._lock:
+            self.coordinates[key] = coordinates
+            self.pending[key] = coordinates
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if len(self.pending) >= self.flush_batch_size or due:
+                self.flush()
+
+    # Writes pending entries with a generation precondition, reloading and retrying once on a conflict
+    def flush(self) -> None:
+        with self._lock:
+            if not self.pending:
+                return
+            for attempt in range(2):
+                try:
+                    blob = self.bucket.blob(self.blob_name)
+                    blob.upload_from_string(
+                        json.dumps(self.coordinates, separators=(',', ':')),
+                        content_type='application/json',
+                        if_generation_match=self.generation,
+                    )
+                    self.generation = blob.generation or self.generation
+                    self.pending = {}
+                    self._last_flush = time.monotonic()
+                    return
+                except Exception as e:
+                    if attempt:
+                        print(f"Error flushing geocode store: {e}")
+                        return
+                    # Pending entries stay queued for the next flush if the store cannot be reloaded either
+                    try:
+                        self.load()
+                    except Exception as reload_error:
+                        print(f"Error reloading geocode store after a failed flush: {reload_error}")
+                        return
+
+
+geocode_store = GeocodeStore(get_bucket, GEOCODE_STORE_BLOB)
+atexit.register(geocode_store.flush)
+
+# Spaces outgoing geocoding requests so concurrent workers stay under the configured rate
+class RateLimiter:
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+rate_limiter = RateLimiter(GEOCODE_RATE_LIMIT)
+executor = ThreadPoolExecutor(max_workers=GEOCODE_MAX_WORKERS, thread_name_prefix='geocode')
+in_flight: Dict[str, Future] = {}
+in_flight_lock = threading.Lock()
 
+# Resolves an address that is not in the consolidated store
+def lookup_address(address: str) -> Optional[Dict[str, float]]:
+    try:
         # Geocode the address if it's not stored
-        if 'CT' not in address and 'Connecticut' not in address:
-            address = f"{address}, Connecticut"
+        query = address
+        if 'CT' not in query and 'Connecticut' not in query:
+            query = f"{query}, Connecticut"
 
-        from googlemaps import Client
-        gmaps = Client(key=GOOGLE_MAPS_API_KEY)
-        result = gmaps.geocode(address)
+        rate_limiter.wait()
+        with timed('geocode'):
+            result = get_gmaps_client().geocode(query)
 
         if result and len(result) > 0:
             location = result[0]['geometry']['location']
@@ -35,9 +160,7 @@ def geocode_address(address: str) -> Optional[Dict[str, float]]:
                 'lng': location['lng']
             }
 
-            # Stores the coordinates in Google Cloud Storage with the address as the filename
-            blob = bucket.blob(blob_name)
-            blob.upload_from_string(json.dumps(coordinates))
+            geocode_store.put(address, coordinates)
             print (coordinates)
             return coordinates
 
@@ -45,3 +168,56 @@ def geocode_address(address: str) -> Optional[Dict[str, float]]:
         print(f"Geocoding error for {address}: {str(e)}")
 
     return None
+
+# Starts a lookup on the thread pool, or joins the one already running for the same address
+def submit_lookup(address: str) -> Future:
+    key = normalize_address(address)
+    with in_flight_lock:
+        future = in_flight.get(key)
+        if future is not None:
+            return future
+        future = executor.submit(lookup_address, address)
+        in_flight[key] = future
+    # Attached outside the lock since an already finished future runs the callback immediately in this thread
+    future.add_done_callback(lambda _: discard_in_flight(key, future))
+    return future
+
+def discard_in_flight(key: str, future: Future) -> None:
+    with in_flight_lock:
+        if in_flight.get(key) is future:
+            del in_flight[key]
+
+def geocode_address(address: str) -> Optional[Dict[str, float]]:
+    try:
+        coordinates = geocode_store.get(address)
+        if coordinates:
+            return coordinates
+    except Exception as e:
+        print(f"Geocoding error for {address}: {str(e)}")
+        return None
+
+    return submit_lookup(address).result()
+
+# Geocodes many addresses at once, resolving unique cache misses concurrently
+def geocode_addresses(addresses: Iterable[str]) -> Dict[str, Optional[Dict[str, float]]]:
+    results: Dict[str, Optional[Dict[str, float]]] = {}
+    futures: Dict[str, Future] = {}
+
+    for address in addresses:
+        if address in results or address in futures:
+            continue
+        try:
+            coordinates = geocode_store.get(address)
+        except Exception as e:
+            print(f"Geocoding error for {address}: {str(e)}")
+            results[address] = None
+            continue
+        if coordinates:
+            results[address] = coordinates
+        else:
+            futures[address] = submit_lookup(address)
+
+    for address, future in futures.items():
+        results[address] = future.result()
+
+    return results
@@ -0,0 +1,112 @@
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Each intent lists the scraper outputs (by blob stem) that can answer it and weighted patterns that signal it
+INTENTS: List[Dict[str, Any]] = [
+    {
+        'name': 'food',
+        'sources': ['calendar_events'],
+        'patterns': [(r'\bfood (?:banks?|pantr(?:y|ies))\b', 3.0), (r'\bpantr(?:y|ies)\b', 2.0), (r'\b(?:food|meals?|groceries|hungry)\b', 1.0)],
+    },
+    {
+        'name': 'diapers',
+        'sources': ['diaper_connections'],
+        'patterns': [(r'\bdiapers?\b', 3.0), (r'\b(?:wipes|diaper bank)\b', 2.0)],
+    },
+    {
+        'name': 'wic',
+        'sources': ['women_infants_children'],
+        'patterns': [(r'\bwic\b', 3.0), (r'\bwomen,? infants,? (?:and|&) children\b', 3.0), (r'\b(?:formula|breastfeeding|nutrition program)\b', 1.5)],
+    },
+    {
+        'name': 'cash_assistance',
+        'sources': ['temporary_family_assistance'],
+        'patterns': [(r'\b(?:tfa|tanf)\b', 3.0), (r'\btemporary (?:family )?assistance\b', 3.0), (r'\b(?:cash assistance|welfare|benefits)\b', 1.5)],
+    },
+    {
+        'name': 'milestones',
+        'sources': ['milestones'],
+        'patterns': [(r'\bmilestones?\b', 3.0), (r'\b(?:developmental|development)\b', 1.5), (r'\b(?:crawl|walk|talk|babbl)\w*', 1.0)],
+    },
+    {
+        'name': 'early_intervention',
+        'sources': ['birth_to_3_programs'],
+        'patterns': [(r'\bbirth to (?:3|three)\b', 3.0), (r'\bearly intervention\b', 3.0), (r'\b(?:toddlers?|infants?)\b', 1.0)],
+    },
+    {
+        'name': 'education',
+        'sources': ['state_education_resource_center'],
+        'patterns': [(r'\b(?:serc|iep|special education)\b', 3.0), (r'\b(?:educational|education|school|schools|teachers?|classroom)\b', 1.5)],
+    },
+    {
+        'name': 'support',
+        'sources': ['family_support_and_services', 'autism_support', 'connecticut_resource_directory'],
+        'patterns': [(r'\bsupport groups?\b', 3.0), (r'\b(?:respite|family support|parents? of)\b', 2.0), (r'\bsupport\b', 1.0)],
+    },
+    {
+        'name': 'providers',
+        'sources': ['providers', 'autism_services_resource_directory', 'connecticut_resource_directory'],
+        'patterns': [(r'\b(?:providers?|therapists?|aba|clinics?|doctors?|pediatricians?)\b', 2.5), (r'\b(?:therapy|diagnos\w*|evaluation)\b', 1.5), (r'\bservices?\b', 1.0)],
+    },
+    {
+        'name': 'autism_info',
+        'sources': ['asd_guide', 'asd_symptoms', 'autism_info', 'autism_spectrum_disorder', 'nimh_asd', 'signs_autism', 'cdc_autism_data'],
+        'patterns': [(r'\b(?:signs?|symptoms?|causes?|what is)\b', 1.5), (r'\b(?:autism|asd|autistic|spectrum)\b', 1.0), (r'\b(?:prevalence|statistics|how common|rates?)\b', 2.0)],
+    },
+]
+
+# Returns the scraper stem of a blob, e.g. "Txt files/milestones.txt" -> "milestones"
+def source_stem(name: str) -> str:
+    return os.path.splitext(name.rsplit('/', 1)[-1])[0].lower()
+
+# Weighted-pattern intent classifier that narrows retrieval to the scraper outputs able to answer a question
+class IntentRouter:
+    def __init__(self, intents: Iterable[Dict[str, Any]] = INTENTS, min_confidence: float = 0.4, runner_up_ratio: float = 0.5, smoothing: float = 1.0):
+        self.intents = [
+            {**intent, 'patterns': [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in intent['patterns']]}
+            for intent in intents
+        ]
+        self.min_confidence = min_confidence
+        self.runner_up_ratio = runner_up_ratio
+        self.smoothing = smoothing
+
+    def scores(self, query: str) -> List[Tuple[float, Dict[str, Any]]]:
+        scored = []
+        for intent in self.intents:
+            score = sum(weight for pattern, weight in intent['patterns'] if pattern.search(query))
+            if score:
+                scored.append((score, intent))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored
+
+    # Returns the decision with its confidence; sources is None when retrieval should search every blob
+    def route(self, query: str) -> Dict[str, Any]:
+        scored = self.scores(query)
+        total = sum(score for score, _ in scored) + self.smoothing
+        decision = {
+            'intent': None,
+            'confidence': 0.0,
+            'sources': None,
+            'scores': {intent['name']: round(score, 2) for score, intent in scored},
+        }
+        if not scored:
+            return decision
+
+        top_score, top_intent = scored[0]
+        decision['intent'] = top_intent['name']
+        decision['confidence'] = round(top_score / total, 3)
+        if decision['confidence'] < self.min_confidence:
+            return decision
+
+        # Close runners-up keep their sources too, so a mixed question still finds both datasets
+        sources: List[str] = []
+        for score, intent in scored:
+            if score < top_score * self.runner_up_ratio:
+                break
+            sources.extend(source for source in intent['sources'] if source not in sources)
+        decision['sources'] = sources
+        return decision
+
+def matches_sources(name: str, sources: Optional[Sequence[str]]) -> bool:
+    return sources is None or source_stem(name) in sources
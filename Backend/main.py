@@ -1,42 +1,71 @@
-from flask import Flask, request, jsonify
-from openai import OpenAI
+from flask import Blueprint, Flask, Response, request, jsonify, make_response, stream_with_context
 from flask_cors import CORS
-from google.cloud import storage
-import googlemaps
 import os
 import json
-from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
+import math
 import re
-from geocoding_manager import geocode_address
-
-app = Flask(__name__)
-CORS(app)
-
-
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-storage_client = storage.Client()
-bucket_name = 'beacon-database'
-bucket = storage_client.get_bucket(bucket_name)
-
-# Retrieves either a summary or full data from storage based on a query
-def get_summary_or_full_data(query):
-    txt_files = [blob for blob in bucket.list_blobs(prefix="Txt files/") if blob.name.endswith('.txt')]
-    
-    relevant_summary = None
-    for blob in txt_files:
-        if "food bank" in blob.name.lower() or query.lower() in blob.name.lower():
-            relevant_summary = blob.download_as_text()
-            break
-
-    if relevant_summary:
-        return relevant_summary
-    else:
-        json_files = [blob for blob in bucket.list_blobs() if blob.name.endswith('.json')]
-        for blob in json_files:
-            data = json.loads(blob.download_as_text())
-            if "food bank" in json.dumps(data).lower() or query.lower() in json.dumps(data).lower():
-                return json.dumps(data, indent=2)
+import tempfile
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from geocoding_manager import geocode_addresses, geocode_store
+from event_normalizer import group_events, normalize_events
+from search_index import SearchIndex
+from blob_cache import blob_cache
+from resource_snapshot import ResourceSnapshotStore
+from answer_cache import AnswerCache
+from clients import get_openai_client
+from warmup import Warmup
+from context_packer import pack_chunks
+from spatial_index import SpatialIndex
+from cluster_index import ClusterIndex
+from event_index import EVENT_TIMEZONE, EventIndex, normalize_county, parse_window_bound
+from schedule_index import ScheduleIndex
+from food_bank_query import FOOD_PATTERN, FoodBankDirectory, parse_food_bank_query
+from intent_router import IntentRouter
+from metrics import instrument_app, record_stage, register_caches, registry, timed
+
+api = Blueprint('api', __name__)
+
+search_index = SearchIndex(
+    blob_cache,
+    vector_path=os.environ.get('VECTOR_INDEX_PATH', os.path.join(tempfile.gettempdir(), 'parent_support_vectors.bin')),
+)
+
+NEARBY_MAX_MILES = float(os.environ.get('NEARBY_MAX_MILES', 25))
+NEARBY_PATTERN = re.compile(r'\b(near(?:by|est)?|closest|close (?:to|by)|around)\b', re.IGNORECASE)
+PLACE_PATTERN = re.compile(r'\b(?:[Nn]ear|[Cc]lose to|[Aa]round)\s+(?P<place>[A-Z][\w.\'-]*(?:\s+[A-Z][\w.\'-]*)*)')
+FOOD_BANK_MAX_SITES = int(os.environ.get('FOOD_BANK_MAX_SITES', 10))
+
+CONTEXT_TOKEN_BUDGET = int(os.environ.get('CONTEXT_TOKEN_BUDGET', 1500))
+
+intent_router = IntentRouter(min_confidence=float(os.environ.get('ROUTER_MIN_CONFIDENCE', 0.4)))
+
+answer_cache = AnswerCache(
+    max_entries=int(os.environ.get('ANSWER_CACHE_MAX_ENTRIES', 256)),
+    ttl=float(os.environ.get('ANSWER_CACHE_TTL', 3600)),
+)
+
+# Kept in sync with commonQueries in Frontend/App.js
+COMMON_QUERIES = [
+    "Are there any food banks in Connecticut that are open in the next week?",
+    "Can you provide some basic information about autism spectrum disorder?",
+    "What support groups are available for parents of autistic children in Connecticut?",
+    "What educational resources are available for autistic children in Connecticut?",
+]
+
+# Packs the passages that best match the query into the prompt's token budget, searching only the routed datasets
+def build_context(query, token_budget=CONTEXT_TOKEN_BUDGET):
+    route = intent_router.route(query)
+    with timed('retrieval'):
+        results = search_index.search(query, k=50, sources=route['sources'])
+        if not results and route['sources'] is not None:
+            results = search_index.search(query, k=50)
+    chunks = [search_index.get_chunk(chunk_id) for chunk_id, _ in results]
+    context = pack_chunks([chunk for chunk in chunks if chunk], token_budget)
+
+    if context:
+        return context
 
     return "No relevant food bank data found."
 
@@ -68,26 +97,86 @@ def format_food_bank_response(raw_response):
 
     return "\n\n".join(formatted_locations)
 
-# Communicates with Chat-GPT to generate responses
+# Incrementally formats streamed food bank text, releasing each location block once it is complete
+class FoodBankStreamFormatter:
+    def __init__(self):
+        self.buffer = ''
+        self.emitted = 0
+
+    def _complete_block_end(self) -> int:
+        start = self.buffer.find('🏢')
+        if start == -1:
+            return -1
+        hours = self.buffer.find('⏰', start)
+        if hours == -1:
+            return -1
+        ends = [end for end in (self.buffer.find('\n\n', hours), self.buffer.find('🏢', hours)) if end != -1]
+        return min(ends) if ends else -1
+
+    def _format(self, segment: str) -> List[str]:
+        formatted = format_food_bank_response(segment)
+        if not formatted:
+            return []
+        prefix = "\n\n" if self.emitted else ""
+        self.emitted += 1
+        return [prefix + formatted]
+
+    def feed(self, text: str) -> List[str]:
+        self.buffer += text
+        blocks = []
+        end = self._complete_block_end()
+        while end != -1:
+            segment, self.buffer = self.buffer[:end], self.buffer[end:]
+            blocks.extend(self._format(segment))
+            end = self._complete_block_end()
+        return blocks
+
+    def finish(self) -> List[str]:
+        segment, self.buffer = self.buffer, ''
+        return self._format(segment)
+
+def build_chat_messages(user_input: str, combined_context: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": """You are an assistant with access to specific user data. 
+         When listing locations like food banks, format your response as follows:
+         
+         🏢 [LOCATION NAME]
+         📍 Address: [address]
+         ⏰ Hours: [time]
+         
+         Use two line breaks between each location."""},
+        {"role": "user", "content": user_input},
+        {"role": "system", "content": f"Here's some context: {combined_context}"}
+    ]
+
+# Returns the version of the retrieved context, which changes whenever the indexed blobs change
+def context_version():
+    try:
+        search_index.refresh()
+    except Exception as e:
+        print(f"Error refreshing search index: {e}")
+    return search_index.version
+
+# Answers from the cache when the same question was asked against the same data, otherwise asks Chat-GPT
 def chat_with_gpt(user_input):
-    data = get_summary_or_full_data(user_input)
-    combined_context = data[:4096]
+    version = context_version()
+    cached = answer_cache.get(user_input, version)
+    if cached is not None:
+        return cached
+
+    answer = complete_chat(user_input)
+    answer_cache.put(user_input, version, answer)
+    return answer
+
+# Communicates with Chat-GPT to generate responses
+def complete_chat(user_input):
+    combined_context = build_context(user_input)
     
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[
-            {"role": "system", "content": """You are an assistant with access to specific user data. 
-             When listing locations like food banks, format your response as follows:
-             
-             🏢 [LOCATION NAME]
-             📍 Address: [address]
-             ⏰ Hours: [time]
-             
-             Use two line breaks between each location."""},
-            {"role": "user", "content": user_input},
-            {"role": "system", "content": f"Here's some context: {combined_context}"}
-        ]
-    )
+    with timed('openai'):
+        response = get_openai_client().chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=build_chat_messages(user_input, combined_context)
+        )
     
     raw_response = response.choices[0].message.content
     
@@ -100,131 +189,402 @@ def chat_with_gpt(user_input):
     
     return raw_response
 
+# Streams a cached answer in one piece, or Chat-GPT output as it arrives while caching the result
+def stream_chat_with_gpt(user_input):
+    version = context_version()
+    cached = answer_cache.get(user_input, version)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    for text in stream_completion(user_input):
+        parts.append(text)
+        yield text
+    answer_cache.put(user_input, version, ''.join(parts))
+
+# Streams Chat-GPT output as text fragments, formatting food bank blocks as they complete
+def stream_completion(user_input):
+    combined_context = build_context(user_input)
+
+    started = time.perf_counter()
+    stream = get_openai_client().chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=build_chat_messages(user_input, combined_context),
+        stream=True
+    )
 
-gmaps = googlemaps.Client(key=os.environ.get('GOOGLE_MAPS_API_KEY'))
-
-# Extracts location data from an event dictionary
-def parse_location_data(event: Dict[str, Any]) -> Dict[str, Any]:
-    if not event:
-        return {}
-
-    name = event.get('summary', '').strip()
-
-    address = event.get('location', '').strip()
-
-    time = ''
-    description = event.get('description', '')
-    if description:
-        soup = BeautifulSoup(description, 'html.parser')
-        time_pattern = re.compile(r'\d{1,2}:\d{2}[AP]M-\d{1,2}:\d{2}[AP]M')
-        for b_tag in soup.find_all('b'):
-            time_match = time_pattern.search(b_tag.text)
-            if time_match:
-                time = time_match.group(0)
-                break
-
-    if description:
-        soup = BeautifulSoup(description, 'html.parser')
-        clean_text = soup.get_text(' ', strip=True)
-
-        county_pattern = re.compile(r'([A-Z]+\s+COUNTY)')
-        county_match = county_pattern.search(clean_text)
-        county = county_match.group(1) if county_match else ''
-
-        schedule_pattern = re.compile(r'Every \d+ weeks? on ([A-Za-z]+)')
-        schedule_match = schedule_pattern.search(clean_text)
-        schedule = schedule_match.group(0) if schedule_match else ''
+    first_token = True
+    formatter = FoodBankStreamFormatter() if "food bank" in user_input.lower() else None
+    raw_response = ''
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ''
+        if not delta:
+            continue
+        if first_token:
+            record_stage('openai_first_token', time.perf_counter() - started)
+            first_token = False
+        if formatter is None:
+            yield delta
+            continue
+        raw_response += delta
+        yield from formatter.feed(delta)
+
+    if formatter is not None:
+        blocks = formatter.finish()
+        yield from blocks
+        # Fall back to the unformatted answer when the model did not follow the location template
+        if not formatter.emitted:
+            yield raw_response
+    record_stage('openai', time.perf_counter() - started)
+
+# Answers the chat UI's quick queries in the background so the first clicks are served from the cache
+def prewarm_answer_cache():
+    for query in COMMON_QUERIES:
+        try:
+            if answer_food_bank(query):
+                continue
+            chat_with_gpt(query)
+        except Exception as e:
+            print(f"Error prewarming answer for '{query}': {e}")
 
-        clean_description = clean_text
-        if time:
-            clean_description = clean_description.replace(time, '').strip()
-        if schedule:
-            clean_description = clean_description.replace(schedule, '').strip()
-        if county:
-            clean_description = clean_description.replace(county, '').strip()
+# Encodes one Server-Sent Event
+def sse_event(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-        clean_description = re.sub(r'\s*,\s*', ', ', clean_description)
-        clean_description = re.sub(r'\s+', ' ', clean_description)
-        clean_description = clean_description.strip(' ,')
-    else:
-        clean_description = ''
-        county = ''
-        schedule = ''
-
-    coordinates = {}
-    if 'lat' in event and 'lng' in event:
-        coordinates = {
-            'lat': float(event['lat']),
-            'lng': float(event['lng'])
-        }
-    
-    return {
-        'id': event.get('id'),
-        'name': name,
-        'address': address,
-        'time': time,
-        'county': county,
-        'description': clean_description,
-        'schedule': schedule,
-        'lat': coordinates.get('lat'),
-        'lng': coordinates.get('lng')
-    }
+CALENDAR_EVENTS_BLOB = 'calendar_events.json'
 
 # Fetches resources from the Google Cloud Storage bucket and processes location data
-def fetch_resources() -> List[Dict[str, Any]]:
+def fetch_resources(generation: Optional[int] = None) -> List[Dict[str, Any]]:
     try:
-        blob = bucket.blob('calendar_events.json')
-        json_data = blob.download_as_text()
-        resources = json.loads(json_data)
+        resources = blob_cache.get_json(CALENDAR_EVENTS_BLOB, generation)
 
         if not isinstance(resources, list):
             resources = [resources]
 
-        processed_resources = []
-        for resource in resources:
-            if not isinstance(resource, dict):
-                continue
-            location_info = parse_location_data(resource)
+        # Recurring stops arrive once per occurrence; parse and geocode each site once
+        with timed('html_parse'):
+            normalized = normalize_events(group_events(resources))
 
+        located_resources = []
+        for location_info in normalized:
             if location_info.get('address'):
-                coordinates = geocode_address(location_info['address'])
-                if coordinates:
-                    location_info['lat'] = coordinates['lat']
-                    location_info['lng'] = coordinates['lng']
-                else:
-                    print(f"Could not geocode address: {location_info['address']}")
-                    continue
-                
-                processed_resources.append(location_info)
+                located_resources.append(location_info)
             else:
                 print(f"No valid address found for resource {location_info.get('id')}")
-                
+
+        coordinates_by_address = geocode_addresses(info['address'] for info in located_resources)
+
+        processed_resources = []
+        for location_info in located_resources:
+            coordinates = coordinates_by_address.get(location_info['address'])
+            if coordinates:
+                location_info['lat'] = coordinates['lat']
+                location_info['lng'] = coordinates['lng']
+            else:
+                print(f"Could not geocode address: {location_info['address']}")
+                continue
+
+            processed_resources.append(location_info)
+
+        geocode_store.flush()
         return processed_resources
     except Exception as e:
         print(f"Error fetching resources: {str(e)}")
         return []
 
-@app.route('/api/resources')
+resource_snapshots = ResourceSnapshotStore(blob_cache, CALENDAR_EVENTS_BLOB, fetch_resources)
+
+# Answers a viewport query with clusters from the grid index and individual resources only where zoomed in
+def get_viewport_resources(snapshot):
+    try:
+        south, west, north, east = (float(value) for value in request.args['bbox'].split(','))
+        zoom = int(request.args.get('zoom', 0))
+    except (KeyError, ValueError):
+        return jsonify({'status': 'error', 'message': 'bbox must be south,west,north,east and zoom an integer'}), 400
+
+    cluster_index = snapshot.derive('cluster_index', ClusterIndex)
+    clusters, points = cluster_index.query((south, west, north, east), zoom)
+    return jsonify({
+        'status': 'success',
+        'zoom': zoom,
+        'clusters': clusters,
+        'data': points
+    })
+
+@api.route('/api/resources')
 def get_resources():
-    resources = fetch_resources()
-    if resources:
-        return jsonify({
-            'status': 'success',
-            'data': resources
-        })
+    snapshot = resource_snapshots.current()
+    if snapshot and 'bbox' in request.args:
+        return get_viewport_resources(snapshot)
+    if snapshot and any(name in request.args for name in ('from', 'to', 'county')):
+        return get_time_window_resources(snapshot)
+    if snapshot:
+        use_gzip = 'gzip' in request.accept_encodings
+        etag = snapshot.gzip_etag if use_gzip else snapshot.etag
+
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            response = make_response(snapshot.gzip_body if use_gzip else snapshot.body)
+            response.content_type = 'application/json'
+            if use_gzip:
+                response.headers['Content-Encoding'] = 'gzip'
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('Accept-Encoding')
+        return response
     return jsonify({
         'status': 'error',
         'message': 'Failed to load resources'
     }), 500
 
-@app.route('/chat', methods=['POST'])
+# Answers from/to/county filters from the interval index instead of scanning every event
+def get_time_window_resources(snapshot):
+    try:
+        window_start = parse_window_bound(request.args.get('from'))
+        window_end = parse_window_bound(request.args.get('to'), end_of_day=True)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    event_index = snapshot.derive('event_index', EventIndex)
+    matches = event_index.between(window_start, window_end, request.args.get('county'))
+    return jsonify({
+        'status': 'success',
+        'total': len(matches),
+        'data': matches
+    })
+
+# Returns the spatial index for the current resource snapshot, built once per data version
+def get_spatial_index() -> Optional[SpatialIndex]:
+    snapshot = resource_snapshots.current()
+    return snapshot.derive('spatial_index', SpatialIndex) if snapshot else None
+
+def parse_float_arg(name: str, default: Optional[float] = None) -> Optional[float]:
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be a finite number")
+    return number
+
+# Answers "k nearest" and "within R miles" queries around a point, sorted by distance and paginated
+@api.route('/api/resources/nearby')
+def nearby_resources():
+    try:
+        lat = parse_float_arg('lat')
+        lng = parse_float_arg('lng')
+        radius = parse_float_arg('radius')
+        k = int(request.args.get('k', 10 if radius is None else 0))
+        page = max(1, int(request.args.get('page', 1)))
+        per_page = min(100, max(1, int(request.args.get('per_page', 20))))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid query parameters'}), 400
+    if lat is None or lng is None:
+        return jsonify({'status': 'error', 'message': 'lat and lng are required'}), 400
+    if k <= 0 and radius is None:
+        return jsonify({'status': 'error', 'message': 'k must be positive unless a radius is given'}), 400
+    if radius is not None and radius < 0:
+        return jsonify({'status': 'error', 'message': 'radius must not be negative'}), 400
+
+    spatial_index = get_spatial_index()
+    if spatial_index is None:
+        return jsonify({'status': 'error', 'message': 'Failed to load resources'}), 500
+
+    if k > 0:
+        matches = spatial_index.nearest(lat, lng, k, max_distance=radius)
+    else:
+        matches = spatial_index.within(lat, lng, radius)
+
+    start = (page - 1) * per_page
+    return jsonify({
+        'status': 'success',
+        'total': len(matches),
+        'page': page,
+        'per_page': per_page,
+        'data': [
+            {**resource, 'distance_miles': round(distance, 2)}
+            for distance, resource in matches[start:start + per_page]
+        ]
+    })
+
+# Renders one resource with the same template the chatbot uses for food bank answers
+def format_location_entry(resource: Dict[str, Any], distance: Optional[float] = None) -> str:
+    name = resource['name'] if distance is None else f"{resource['name']} ({distance:.1f} mi)"
+    hours = ' '.join(part for part in (resource.get('time'), resource.get('schedule')) if part) or 'See description'
+    return (
+        f"🏢 {name}\n"
+        f"📍 Address: {resource['address']}\n"
+        f"⏰ Hours: {hours}\n"
+    )
+
+# Answers "food banks near me" style questions from the spatial index without calling the model
+def answer_nearby(user_input: str, lat: Optional[float] = None, lng: Optional[float] = None, k: int = 5) -> Optional[str]:
+    if not FOOD_PATTERN.search(user_input) or not NEARBY_PATTERN.search(user_input):
+        return None
+
+    place = PLACE_PATTERN.search(user_input)
+    if place:
+        coordinates = geocode_addresses([place.group('place')]).get(place.group('place'))
+        if not coordinates:
+            return None
+        lat, lng = coordinates['lat'], coordinates['lng']
+    if lat is None or lng is None:
+        return None
+
+    spatial_index = get_spatial_index()
+    if spatial_index is None:
+        return None
+    matches = spatial_index.nearest(lat, lng, k, max_distance=NEARBY_MAX_MILES)
+    if not matches:
+        return f"I couldn't find any food banks within {NEARBY_MAX_MILES:.0f} miles of that location."
+    return "\n\n".join(format_location_entry(resource, distance) for distance, resource in matches)
+
+# Returns the schedule index for the current snapshot, rebuilt daily so upcoming occurrences stay current
+def get_schedule_index(snapshot) -> ScheduleIndex:
+    today = datetime.now(EVENT_TIMEZONE).date().isoformat()
+    return snapshot.derive('schedule_index', ScheduleIndex, version=today)
+
+# Finds food bank sites matching the extracted filters, each with its next matching occurrence
+def find_food_banks(snapshot, query: Dict[str, Any], now: Optional[datetime] = None) -> List[Tuple[Optional[datetime], Dict[str, Any]]]:
+    if query['window']:
+        matches = snapshot.derive('event_index', EventIndex).occurrences_between(*query['window'], query['county'])
+    elif query['weekday'] is not None:
+        matches = [(start, resource) for (start, _), resource in get_schedule_index(snapshot).open_during(query['weekday'], *query['hours'], now=now)]
+    else:
+        schedule_index = get_schedule_index(snapshot)
+        matches = []
+        for resource in snapshot.resources:
+            occurrences = schedule_index.next_occurrences(resource, now)
+            matches.append((occurrences[0][0] if occurrences else None, resource))
+        matches.sort(key=lambda match: (match[0] is None, match[0] or datetime.max.replace(tzinfo=EVENT_TIMEZONE)))
+
+    if query['county'] and not query['window']:
+        matches = [match for match in matches if normalize_county(match[1].get('county')) == query['county']]
+    if query['town']:
+        in_town = {id(resource) for resource in snapshot.derive('food_bank_directory', FoodBankDirectory).in_town(query['town'])}
+        matches = [match for match in matches if id(match[1]) in in_town]
+    return matches
+
+# Answers food bank lookups from the parsed event records with the chat template, so only other questions reach the model
+def answer_food_bank(user_input: str, now: Optional[datetime] = None) -> Optional[str]:
+    # Checked before touching the snapshot so other questions never wait on a resource build
+    if not FOOD_PATTERN.search(user_input):
+        return None
+    snapshot = resource_snapshots.current()
+    if snapshot is None:
+        return None
+    query = parse_food_bank_query(user_input, snapshot.derive('food_bank_directory', FoodBankDirectory), now)
+    if query is None:
+        return None
+
+    matches = find_food_banks(snapshot, query, now)
+    if not matches:
+        place = query['town'] or (query['county'] or '').title()
+        return f"I couldn't find any food bank distributions matching your question{' in ' + place if place else ''}."
+
+    entries = []
+    for start, resource in matches[:FOOD_BANK_MAX_SITES]:
+        next_line = f"📅 Next: {start.strftime('%a %b %d, %I:%M %p')}\n" if start else ''
+        entries.append(format_location_entry(resource) + next_line)
+    if len(matches) > FOOD_BANK_MAX_SITES:
+        entries.append(f"…and {len(matches) - FOOD_BANK_MAX_SITES} more sites. See the map for the full list.")
+    return "\n\n".join(entries)
+
+def request_coordinates() -> Tuple[Optional[float], Optional[float]]:
+    try:
+        lat, lng = request.json.get('lat'), request.json.get('lng')
+        if lat is None or lng is None:
+            return None, None
+        lat, lng = float(lat), float(lng)
+        return (lat, lng) if math.isfinite(lat) and math.isfinite(lng) else (None, None)
+    except (TypeError, ValueError):
+        return None, None
+
+@api.route('/chat', methods=['POST'])
 def chat():
     user_query = request.json.get('query')
     if not user_query:
         return jsonify({"error": "No query provided"}), 400
 
-    response = chat_with_gpt(user_query)
+    response = answer_nearby(user_query, *request_coordinates()) or answer_food_bank(user_query) or chat_with_gpt(user_query)
     return jsonify({"response": response})
 
+@api.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    user_query = request.json.get('query')
+    if not user_query:
+        return jsonify({"error": "No query provided"}), 400
+
+    direct_answer = answer_nearby(user_query, *request_coordinates()) or answer_food_bank(user_query)
+
+    def generate():
+        try:
+            if direct_answer:
+                yield sse_event({"delta": direct_answer})
+                yield sse_event({}, event="done")
+                return
+            for text in stream_chat_with_gpt(user_query):
+                yield sse_event({"delta": text})
+            yield sse_event({}, event="done")
+        except Exception as e:
+            print(f"Error streaming response: {e}")
+            yield sse_event({"error": "Failed to generate a response"}, event="error")
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+# current() returns None rather than raising when the calendar blob is missing or the build fails
+def warm_resource_snapshot() -> None:
+    if resource_snapshots.current() is None:
+        raise RuntimeError(f"No resource snapshot could be built from {CALENDAR_EVENTS_BLOB}")
+
+warmup = Warmup()
+warmup.add('search_index', lambda: search_index.refresh(force=True))
+warmup.add('geocode_store', geocode_store.load)
+warmup.add('resource_snapshot', warm_resource_snapshot)
+if os.environ.get('ANSWER_CACHE_PREWARM', '1') != '0':
+    warmup.add('answer_cache', prewarm_answer_cache, required=False)
+
+# Shows which datasets a question would be routed to, and how confident the router is, for debugging
+@api.route('/api/route')
+def route_query():
+    query = request.args.get('q')
+    if not query:
+        return jsonify({'status': 'error', 'message': 'q is required'}), 400
+    return jsonify({'status': 'success', 'query': query, **intent_router.route(query)})
+
+register_caches({'blob': blob_cache, 'answer': answer_cache, 'geocode': geocode_store})
+
+# Exposes latency histograms, request counters and cache hit rates in Prometheus text format
+@api.route('/metrics')
+def prometheus_metrics():
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+# Reports whether caches and indexes are warm so load balancers only route to ready instances
+@api.route('/ready')
+def ready():
+    report = warmup.report()
+    return jsonify(report), 200 if report['ready'] else 503
+
+# Builds the Flask app without touching any external service; clients connect on first use
+def create_app(start_warmup: bool = True) -> Flask:
+    app = Flask(__name__)
+    CORS(app)
+    app.register_blueprint(api)
+    instrument_app(app)
+    if start_warmup and os.environ.get('WARMUP_ON_START', '1') != '0':
+        warmup.start()
+    return app
+
+app = create_app()
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
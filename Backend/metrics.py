@@ -0,0 +1,154 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from flask import g, has_request_context, request
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def format_labels(labelnames: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(labelnames, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines.extend(f"{self.name}{format_labels(self.labelnames, key)} {value:g}" for key, value in values)
+        return lines
+
+# Cumulative-bucket latency histogram in Prometheus exposition format
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    # Per-series state is bucket counts followed by the running sum and count
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, values in series:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{format_labels(self.labelnames, key, ('le', f'{bound:g}'))} {cumulative:g}")
+            lines.append(f"{self.name}_bucket{format_labels(self.labelnames, key, ('le', '+Inf'))} {values[-1]:g}")
+            lines.append(f"{self.name}_sum{format_labels(self.labelnames, key)} {values[-2]:.6f}")
+            lines.append(f"{self.name}_count{format_labels(self.labelnames, key)} {values[-1]:g}")
+        return lines
+
+# Counter whose values are read at scrape time from objects that already keep their own tallies
+class CallbackCounter:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str], collect: Callable[[], Dict[Tuple[str, ...], float]]):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        lines.extend(f"{self.name}{format_labels(self.labelnames, key)} {value:g}" for key, value in sorted(self.collect().items()))
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics: List = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+STAGE_SECONDS = registry.register(Histogram('parent_support_stage_seconds', 'Time spent in each backend stage.', ['stage']))
+HTTP_REQUEST_SECONDS = registry.register(Histogram('parent_support_http_request_seconds', 'Request latency by endpoint.', ['endpoint', 'method']))
+HTTP_REQUESTS = registry.register(Counter('parent_support_http_requests_total', 'Requests by endpoint and status.', ['endpoint', 'method', 'status']))
+
+# Adds the hit and miss tallies of named caches as parent_support_cache_requests_total{cache,result}
+def register_caches(caches: Dict[str, object]) -> None:
+    def collect() -> Dict[Tuple[str, ...], float]:
+        values = {}
+        for name, cache in caches.items():
+            values[(name, 'hit')] = cache.hits
+            values[(name, 'miss')] = cache.misses
+        return values
+    registry.register(CallbackCounter('parent_support_cache_requests_total', 'Cache lookups by cache and result.', ['cache', 'result'], collect))
+
+def record_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if has_request_context():
+        timings = g.setdefault('server_timings', {})
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+# Times a block into the stage histogram and, inside a request, into that response's Server-Timing header
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+def server_timing_header(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items()]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(entries)
+
+# Records per-request latency and attaches the Server-Timing breakdown to every response
+def instrument_app(app) -> None:
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, method=request.method)
+        HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+        response.headers['Server-Timing'] = server_timing_header(g.get('server_timings', {}), elapsed)
+        return response
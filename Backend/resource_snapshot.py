@@ -0,0 +1,93 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Pre-serialized and pre-compressed /api/resources payload for one source blob generation
+class ResourceSnapshot:
+    def __init__(self, generation: Optional[int], resources: List[Dict[str, Any]]):
+        self.generation = generation
+        self.resources = resources
+        self.body = json.dumps({'status': 'success', 'data': resources}, separators=(',', ':')).encode('utf-8')
+        self.gzip_body = gzip.compress(self.body, compresslevel=6, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = digest
+        self.gzip_etag = f"{digest}-gz"
+        self.built_at = time.time()
+        self._derived: Dict[str, Tuple[Any, Any]] = {}
+        self._derive_lock = threading.Lock()
+
+    # Builds a structure from this snapshot's resources once and reuses it until the data changes.
+    # A different `version` (e.g. the current date) replaces the stored structure rather than adding another.
+    def derive(self, name: str, build: Callable[[List[Dict[str, Any]]], Any], version: Any = None) -> Any:
+        with self._derive_lock:
+            derived = self._derived.get(name)
+            if derived is None or derived[0] != version:
+                derived = self._derived[name] = (version, build(self.resources))
+            return derived[1]
+
+# Serves the latest snapshot and rebuilds it in the background when the source blob generation changes.
+# A failed or empty build is remembered per generation and not retried until its backoff passes,
+# so an outage does not turn every request into another full build; the last good snapshot is served meanwhile.
+class ResourceSnapshotStore:
+    def __init__(self, blob_cache, blob_name: str, build: Callable[[Optional[int]], List[Dict[str, Any]]], retry_delay: float = 30.0, max_retry_delay: float = 600.0):
+        self.blob_cache = blob_cache
+        self.blob_name = blob_name
+        self.build = build
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._snapshot: Optional[ResourceSnapshot] = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+        self._failed_generation: Optional[int] = None
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def _backing_off(self, generation: Optional[int]) -> bool:
+        return self._failures > 0 and self._failed_generation == generation and time.monotonic() < self._retry_at
+
+    def _build_snapshot(self, generation: Optional[int]) -> Optional[ResourceSnapshot]:
+        try:
+            resources = self.build(generation)
+        except Exception as e:
+            print(f"Error building resource snapshot: {e}")
+            resources = None
+        if not resources:
+            self._failures = self._failures + 1 if self._failed_generation == generation else 1
+            self._failed_generation = generation
+            delay = min(self.retry_delay * 2 ** (self._failures - 1), self.max_retry_delay)
+            self._retry_at = time.monotonic() + delay
+            print(f"Resource snapshot build for generation {generation} failed; retrying in {delay:.0f}s")
+            return None
+        snapshot = ResourceSnapshot(generation, resources)
+        self._snapshot = snapshot
+        self._failures = 0
+        self._failed_generation = None
+        return snapshot
+
+    def _rebuild_in_background(self, generation: Optional[int]) -> None:
+        try:
+            self._build_snapshot(generation)
+        finally:
+            self._rebuilding = False
+
+    # Returns the current snapshot, building it synchronously only when none exists yet
+    def current(self) -> Optional[ResourceSnapshot]:
+        generation = self.blob_cache.get_generation(self.blob_name)
+        snapshot = self._snapshot
+
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    return None if self._backing_off(generation) else self._build_snapshot(generation)
+                return self._snapshot
+
+        if snapshot.generation != generation:
+            with self._lock:
+                if not self._rebuilding and not self._backing_off(generation):
+                    self._rebuilding = True
+                    threading.Thread(target=self._rebuild_in_background, args=(generation,), daemon=True).start()
+
+        return snapshot
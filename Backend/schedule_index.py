@@ -0,0 +1,134 @@
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from event_index import EVENT_TIMEZONE, parse_event_time
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+RECURRENCE_PATTERN = re.compile(r'Every (\d+) weeks? on ([A-Za-z]+)', re.IGNORECASE)
+TIME_RANGE_PATTERN = re.compile(r'(\d{1,2}:\d{2}[AP]M)-(\d{1,2}:\d{2}[AP]M)', re.IGNORECASE)
+
+def weekday_index(name: str) -> Optional[int]:
+    name = name.lower()
+    for index, weekday in enumerate(WEEKDAYS):
+        if len(name) >= 3 and weekday.startswith(name[:3]):
+            return index
+    return None
+
+def parse_clock(value: str) -> time:
+    return datetime.strptime(value.upper(), '%I:%M%p').time()
+
+# Parses "Every 2 weeks on Saturday" and "9:00AM-10:30AM" into a JSON-serializable recurrence rule
+def parse_recurrence(schedule: str, time_range: str = '') -> Optional[Dict[str, Any]]:
+    match = RECURRENCE_PATTERN.search(schedule or '')
+    if not match:
+        return None
+    weekday = weekday_index(match.group(2))
+    if weekday is None:
+        return None
+
+    start_time = end_time = None
+    time_match = TIME_RANGE_PATTERN.search(time_range or '')
+    if time_match:
+        try:
+            start_time = parse_clock(time_match.group(1)).strftime('%H:%M')
+            end_time = parse_clock(time_match.group(2)).strftime('%H:%M')
+        except ValueError:
+            pass
+
+    return {
+        'interval_weeks': max(1, int(match.group(1))),
+        'weekday': WEEKDAYS[weekday].capitalize(),
+        'start_time': start_time,
+        'end_time': end_time,
+    }
+
+def rule_occurrences(rule: Dict[str, Any], anchor: date, after: date, count: int) -> List[Tuple[datetime, datetime]]:
+    weekday = weekday_index(rule['weekday'])
+    anchor += timedelta(days=(weekday - anchor.weekday()) % 7)
+    step = 7 * rule['interval_weeks']
+    first = anchor + timedelta(days=max(0, -(-(after - anchor).days // step)) * step)
+
+    start_time = time.fromisoformat(rule['start_time']) if rule.get('start_time') else time(0)
+    end_time = time.fromisoformat(rule['end_time']) if rule.get('end_time') else time(23, 59)
+    occurrences = []
+    for n in range(count):
+        day = first + timedelta(days=n * step)
+        occurrences.append((
+            datetime.combine(day, start_time, EVENT_TIMEZONE),
+            datetime.combine(day, end_time, EVENT_TIMEZONE),
+        ))
+    return occurrences
+
+# (weekday, hour) slots an occurrence covers, counting an hour it only ends on as not covered
+def occurrence_slots(start: datetime, end: datetime) -> List[Tuple[int, int]]:
+    last_hour = end.hour if end.minute or end.second or end == start else end.hour - 1
+    return [(start.weekday(), hour) for hour in range(start.hour, max(start.hour, last_hour) + 1)]
+
+def current_time(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now(EVENT_TIMEZONE)).astimezone(EVENT_TIMEZONE)
+
+# Per-record upcoming occurrences and a (weekday, hour) lookup, precomputed once per resource snapshot.
+# Records are keyed by identity since one site can have several records, each with its own schedule.
+# Occurrences that have ended are dropped when answering, so an index built earlier in the day stays correct.
+class ScheduleIndex:
+    def __init__(self, resources: Iterable[Dict[str, Any]], occurrences: int = 8, now: Optional[datetime] = None):
+        now = current_time(now)
+        self.built_at = now
+        self.occurrences = occurrences
+        self.sites: Dict[int, Dict[str, Any]] = {}
+        self.slots: Dict[Tuple[int, int], List[int]] = {}
+
+        dated: Dict[int, List[Tuple[datetime, datetime]]] = {}
+        for resource in resources:
+            key = id(resource)
+            site = self.sites[key] = {'resource': resource, 'rule': resource.get('recurrence') or None, 'anchor': None}
+            for occurrence in resource.get('occurrences') or [resource]:
+                start = parse_event_time(occurrence.get('start'))
+                if start is None:
+                    continue
+                start = start.astimezone(EVENT_TIMEZONE)
+                end = max(start, (parse_event_time(occurrence.get('end')) or start).astimezone(EVENT_TIMEZONE))
+                dated.setdefault(key, []).append((start, end))
+                if site['anchor'] is None or start.date() < site['anchor']:
+                    site['anchor'] = start.date()
+
+        for key, site in self.sites.items():
+            upcoming = [occurrence for occurrence in dated.get(key, []) if occurrence[1] >= now]
+            # One extra projection covers today's occurrence ending before the index is rebuilt
+            if site['rule']:
+                upcoming.extend(rule_occurrences(site['rule'], site['anchor'] or now.date(), now.date(), occurrences + 1))
+            site['occurrences'] = sorted(set(upcoming))[:occurrences + 1]
+            for slot in self._slots(site):
+                self.slots.setdefault(slot, []).append(key)
+
+    # (weekday, hour) slots covered by a record's upcoming occurrences, whether projected from its rule or dated
+    @staticmethod
+    def _slots(site: Dict[str, Any]) -> Iterable[Tuple[int, int]]:
+        return sorted({slot for occurrence in site['occurrences'] for slot in occurrence_slots(*occurrence)})
+
+    # Records open at any point during [from_hour, to_hour) on the given weekday, each with its next matching occurrence
+    def open_during(self, weekday: int, from_hour: int = 0, to_hour: int = 24, now: Optional[datetime] = None) -> List[Tuple[Tuple[datetime, datetime], Dict[str, Any]]]:
+        now = current_time(now)
+        keys: Dict[int, None] = {}
+        for hour in range(from_hour, to_hour):
+            for key in self.slots.get((weekday, hour), ()):
+                keys[key] = None
+
+        matches = []
+        for key in keys:
+            site = self.sites[key]
+            occurrence = next((
+                occurrence for occurrence in site['occurrences']
+                if occurrence[1] >= now and any(day == weekday and from_hour <= hour < to_hour for day, hour in occurrence_slots(*occurrence))
+            ), None)
+            if occurrence:
+                matches.append((occurrence, site['resource']))
+        matches.sort(key=lambda match: match[0][0])
+        return matches
+
+    def next_occurrences(self, resource: Dict[str, Any], now: Optional[datetime] = None) -> List[Tuple[datetime, datetime]]:
+        site = self.sites.get(id(resource))
+        if not site:
+            return []
+        now = current_time(now)
+        return [occurrence for occurrence in site['occurrences'] if occurrence[1] >= now][:self.occurrences]
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from context_packer import chunk_document
+from intent_router import matches_sources
+from metrics import timed
+
+TXT_PREFIX = "Txt files/"
+RRF_K = 60
+EXCLUDED_PREFIXES = ("geocoding/", "manifests/")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset([
+    "a", "an", "and", "any", "are", "as", "at", "be", "by", "can", "do", "for",
+    "from", "how", "i", "in", "is", "it", "me", "my", "of", "on", "or", "some",
+    "that", "the", "there", "this", "to", "what", "when", "where", "which",
+    "who", "with", "you", "your",
+])
+
+# Splits text into lowercase word tokens with stop words removed
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+# Okapi BM25 scoring over an in-memory inverted index
+class BM25Index:
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        self.doc_lengths: Dict[str, int] = {}
+        self.idf: Dict[str, float] = {}
+        self.avg_doc_length = 0.0
+
+    def add(self, doc_id: str, text: str) -> None:
+        term_counts = Counter(tokenize(text))
+        self.doc_lengths[doc_id] = sum(term_counts.values())
+        for term, count in term_counts.items():
+            self.postings[term].append((doc_id, count))
+
+    # Computes idf weights and the average length once all documents are added; a shard reuses its corpus statistics
+    def finalize(self, corpus: Optional['BM25Index'] = None) -> None:
+        if corpus is not None:
+            self.idf = corpus.idf
+            self.avg_doc_length = corpus.avg_doc_length
+            return
+        doc_count = len(self.doc_lengths)
+        self.avg_doc_length = (sum(self.doc_lengths.values()) / doc_count) if doc_count else 0.0
+        self.idf = {
+            term: math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, freq in self.postings[term]:
+                length_norm = 1 - self.b + self.b * self.doc_lengths[doc_id] / (self.avg_doc_length or 1.0)
+                scores[doc_id] += idf * freq * (self.k1 + 1) / (freq + self.k1 * length_norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+# Returns True for blobs that hold retrievable resource content
+def is_indexed_blob(name: str) -> bool:
+    if name.startswith(EXCLUDED_PREFIXES):
+        return False
+    return (name.startswith(TXT_PREFIX) and name.endswith('.txt')) or name.endswith('.json')
+
+# One built version of the search index; refresh swaps in a new one rather than mutating it
+class IndexState:
+    def __init__(self, version: int = 0, generations: Optional[Dict[str, int]] = None, documents: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 chunks: Optional[Dict[str, Dict[str, Any]]] = None, index: Optional[BM25Index] = None, shards: Optional[Dict[str, BM25Index]] = None,
+                 vectors=None, vector_rows: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.version = version
+        self.generations = generations or {}
+        self.documents = documents or {}
+        self.chunks = chunks or {}
+        self.index = index or BM25Index()
+        self.shards = shards or {}
+        self.vectors = vectors
+        self.vector_rows = vector_rows or {}
+
+# Passage-level retrieval index over every text summary and JSON blob in the bucket, rebuilt when blob generations change.
+# Readers take one reference to the current IndexState, so a concurrent refresh never mixes two versions.
+class SearchIndex:
+    def __init__(self, blob_cache, refresh_interval: float = 60.0, chunk_tokens: int = 200, vector_path: Optional[str] = None):
+        self.blob_cache = blob_cache
+        self.refresh_interval = refresh_interval
+        self.chunk_tokens = chunk_tokens
+        self.vector_path = vector_path
+        self.state = IndexState()
+        self._last_checked = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self.state.version
+
+    @property
+    def chunks(self) -> Dict[str, Dict[str, Any]]:
+        return self.state.chunks
+
+    def _list_generations(self) -> Dict[str, int]:
+        generations = {}
+        with timed('gcs_list'):
+            blobs = list(self.blob_cache.bucket.list_blobs())
+        for blob in blobs:
+            if is_indexed_blob(blob.name):
+                generations[blob.name] = blob.generation
+                self.blob_cache.observe(blob.name, blob.generation)
+        return generations
+
+    # Re-lists blob metadata at most once per refresh interval and re-indexes only when generations differ
+    def refresh(self, force: bool = False) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if not force and self.version and now - self._last_checked < self.refresh_interval:
+                return False
+            self._last_checked = now
+
+            previous = self.state
+            generations = self._list_generations()
+            if not force and generations == previous.generations:
+                return False
+
+            documents = {}
+            for name, generation in generations.items():
+                if previous.generations.get(name) == generation and name in previous.documents:
+                    documents[name] = previous.documents[name]
+                    continue
+                try:
+                    documents[name] = chunk_document(name, self.blob_cache.get_text(name, generation), self.chunk_tokens)
+                except Exception as e:
+                    print(f"Error indexing {name}: {e}")
+
+            index = BM25Index()
+            shards = {}
+            chunks = {}
+            for name, document_chunks in documents.items():
+                shard = shards[name] = BM25Index()
+                for position, chunk in enumerate(document_chunks):
+                    chunk_id = f"{name}#{position}"
+                    chunks[chunk_id] = chunk
+                    # Include the blob name so a query like "diaper connections" favours its own source
+                    text = f"{name.replace('_', ' ')} {chunk['text']}"
+                    index.add(chunk_id, text)
+                    shard.add(chunk_id, text)
+            index.finalize()
+            for shard in shards.values():
+                shard.finalize(index)
+
+            vectors = self._load_vectors(chunks, generations)
+            self.state = IndexState(previous.version + 1, generations, documents, chunks, index, shards, vectors, self._vector_rows(vectors))
+            return True
+
+    # Loads or builds the semantic index; retrieval falls back to keywords alone when numpy is unavailable
+    def _load_vectors(self, chunks: Dict[str, Dict[str, Any]], generations: Dict[str, int]):
+        try:
+            from vector_index import load_or_build
+        except ImportError:
+            return None
+        fingerprint = hashlib.sha256(json.dumps(sorted(generations.items())).encode('utf-8')).hexdigest()
+        texts = {chunk_id: f"{chunk['source'].replace('_', ' ')} {chunk['text']}" for chunk_id, chunk in chunks.items()}
+        try:
+            return load_or_build(self.vector_path, texts, fingerprint)
+        except Exception as e:
+            print(f"Error building vector index: {e}")
+            return None
+
+    # Each blob's chunks occupy one contiguous block of vector rows, so a shard is a row range
+    @staticmethod
+    def _vector_rows(vectors) -> Dict[str, Tuple[int, int]]:
+        rows: Dict[str, Tuple[int, int]] = {}
+        if vectors is None:
+            return rows
+        for row, chunk_id in enumerate(vectors.ids):
+            name = chunk_id.rsplit('#', 1)[0]
+            start, _ = rows.get(name, (row, row))
+            rows[name] = (start, row + 1)
+        return rows
+
+    @staticmethod
+    def _keyword_search(state: IndexState, query: str, k: int, names: Optional[List[str]]) -> List[Tuple[str, float]]:
+        if names is None:
+            return state.index.search(query, k)
+        results = [result for name in names for result in state.shards[name].search(query, k)]
+        return sorted(results, key=lambda item: item[1], reverse=True)[:k]
+
+    # Fuses keyword and semantic rankings with reciprocal rank fusion, searching only the blobs of the given sources
+    def search(self, query: str, k: int = 20, sources: Optional[List[str]] = None) -> List[Tuple[str, float]]:
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Error refreshing search index: {e}")
+
+        state = self.state
+        names = None if sources is None else [name for name in state.shards if matches_sources(name, sources)]
+        keyword_results = self._keyword_search(state, query, k, names)
+        vectors = state.vectors
+        if vectors is None:
+            return keyword_results
+
+        rows = None if names is None else [state.vector_rows[name] for name in names if name in state.vector_rows]
+        scores: Dict[str, float] = defaultdict(float)
+        for results in (keyword_results, vectors.search(query, k, rows)):
+            for rank, (chunk_id, _) in enumerate(results):
+                scores[chunk_id] += 1.0 / (RRF_K + rank + 1)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def get_chunk(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        return self.chunks.get(chunk_id)
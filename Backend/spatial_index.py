@@ -0,0 +1,117 @@
+import heapq
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LAT = 69.0
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+# Uniform lat/lng grid over geocoded resources answering radius and k-nearest queries with exact haversine distances
+class SpatialIndex:
+    def __init__(self, resources: Iterable[Dict[str, Any]], cell_size: float = 0.05):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Dict[str, Any]]] = defaultdict(list)
+        self.count = 0
+        self.max_abs_lat = 0.0
+        for resource in resources:
+            if resource.get('lat') is None or resource.get('lng') is None:
+                continue
+            self.cells[self._cell(resource['lat'], resource['lng'])].append(resource)
+            self.max_abs_lat = max(self.max_abs_lat, abs(resource['lat']))
+            self.count += 1
+        rows = [row for row, _ in self.cells] or [0]
+        cols = [col for _, col in self.cells] or [0]
+        self.bounds = (min(rows), max(rows), min(cols), max(cols))
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_size), math.floor(lng / self.cell_size))
+
+    def _ring(self, center: Tuple[int, int], ring: int) -> Iterable[Tuple[int, int]]:
+        row, col = center
+        if ring == 0:
+            yield center
+            return
+        for offset in range(-ring, ring + 1):
+            yield (row - ring, col + offset)
+            yield (row + ring, col + offset)
+        for offset in range(-ring + 1, ring):
+            yield (row + offset, col - ring)
+            yield (row + offset, col + ring)
+
+    # Lower bound on the distance to any point outside the first `ring` rings around the query cell
+    def _ring_bound(self, ring: int, lat: float) -> float:
+        miles_per_degree_lng = MILES_PER_DEGREE_LAT * math.cos(math.radians(min(89.0, max(self.max_abs_lat, abs(lat)))))
+        return ring * self.cell_size * min(MILES_PER_DEGREE_LAT, miles_per_degree_lng)
+
+    def _max_rings(self, center: Tuple[int, int]) -> int:
+        min_row, max_row, min_col, max_col = self.bounds
+        return max(abs(center[0] - min_row), abs(center[0] - max_row), abs(center[1] - min_col), abs(center[1] - max_col))
+
+    # Returns (distance, resource) pairs within radius_miles, nearest first
+    def within(self, lat: float, lng: float, radius_miles: float) -> List[Tuple[float, Dict[str, Any]]]:
+        lat_span = radius_miles / MILES_PER_DEGREE_LAT
+        lng_span = radius_miles / max(1e-6, MILES_PER_DEGREE_LAT * math.cos(math.radians(min(89.0, abs(lat) + lat_span))))
+        min_row, min_col = self._cell(lat - lat_span, lng - lng_span)
+        max_row, max_col = self._cell(lat + lat_span, lng + lng_span)
+
+        matches = []
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > len(self.cells):
+            candidates = (resource for cell in self.cells.values() for resource in cell)
+        else:
+            candidates = (
+                resource
+                for row in range(min_row, max_row + 1)
+                for col in range(min_col, max_col + 1)
+                for resource in self.cells.get((row, col), ())
+            )
+        for resource in candidates:
+            distance = haversine_miles(lat, lng, resource['lat'], resource['lng'])
+            if distance <= radius_miles:
+                matches.append((distance, resource))
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def _scan_nearest(self, lat: float, lng: float, k: int, max_distance: Optional[float]) -> List[Tuple[float, Dict[str, Any]]]:
+        matches = (
+            (haversine_miles(lat, lng, resource['lat'], resource['lng']), resource)
+            for cell in self.cells.values()
+            for resource in cell
+        )
+        if max_distance is not None:
+            matches = (match for match in matches if match[0] <= max_distance)
+        return heapq.nsmallest(k, matches, key=lambda match: match[0])
+
+    # Returns the k nearest (distance, resource) pairs by expanding rings of cells until no closer point can exist
+    def nearest(self, lat: float, lng: float, k: int, max_distance: Optional[float] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        if k <= 0 or not self.count:
+            return []
+        center = self._cell(lat, lng)
+        found: List[Tuple[float, Dict[str, Any]]] = []
+        seen = 0
+        for ring in range(self._max_rings(center) + 1):
+            # Once the probed cells outnumber the occupied ones, a scan of every resource is cheaper than more rings
+            if ring and (2 * ring + 1) ** 2 > len(self.cells):
+                return self._scan_nearest(lat, lng, k, max_distance)
+            for cell in self._ring(center, ring):
+                for resource in self.cells.get(cell, ()):
+                    seen += 1
+                    distance = haversine_miles(lat, lng, resource['lat'], resource['lng'])
+                    if max_distance is None or distance <= max_distance:
+                        found.append((distance, resource))
+            found.sort(key=lambda match: match[0])
+            del found[k:]
+            bound = self._ring_bound(ring, lat)
+            if seen == self.count:
+                break
+            if len(found) == k and found[-1][0] <= bound:
+                break
+            if max_distance is not None and bound > max_distance:
+                break
+        return found
@@ -0,0 +1,154 @@
+import json
+import os
+import tempfile
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from search_index import tokenize
+
+MAGIC = b'PSRVEC1\n'
+ALIGNMENT = 64
+FEATURE_BUCKETS = 1 << 20
+
+@lru_cache(maxsize=1 << 16)
+def char_ngrams(word: str, min_n: int = 3, max_n: int = 5) -> Tuple[str, ...]:
+    marked = f"<{word}>"
+    return tuple(f"c:{marked[i:i + n]}" for n in range(min_n, max_n + 1) for i in range(len(marked) - n + 1))
+
+# Word unigrams, word bigrams and character n-grams, so "diapers" and "diaper" still overlap
+def extract_features(text: str) -> Counter:
+    words = tokenize(text)
+    features = [f"w:{word}" for word in words]
+    features.extend(f"b:{first} {second}" for first, second in zip(words, words[1:]))
+    for word in words:
+        features.extend(char_ngrams(word))
+    return Counter(features)
+
+@lru_cache(maxsize=1 << 18)
+def feature_hash(feature: str) -> int:
+    return zlib.crc32(feature.encode('utf-8'))
+
+# Hashed TF-IDF vectors projected into a dense float32 matrix for vectorized cosine top-k
+class VectorIndex:
+    def __init__(self, ids: List[str], matrix: np.ndarray, idf: np.ndarray, fingerprint: str = ''):
+        self.ids = ids
+        self.matrix = matrix
+        self.idf = idf
+        self.fingerprint = fingerprint
+        self.dim = matrix.shape[1]
+
+    @staticmethod
+    def _hash_features(features: Counter) -> Tuple[np.ndarray, np.ndarray]:
+        hashes = np.fromiter((feature_hash(feature) for feature in features), dtype=np.int64, count=len(features))
+        counts = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+        return hashes, counts
+
+    @staticmethod
+    def _project(hashes: np.ndarray, counts: np.ndarray, idf: np.ndarray, dim: int) -> np.ndarray:
+        # Signed feature hashing keeps inner products unbiased when features collide
+        signs = np.where((hashes >> 31) & 1, 1.0, -1.0)
+        weights = signs * (1.0 + np.log(counts)) * idf[hashes % FEATURE_BUCKETS]
+        vector = np.bincount(hashes % dim, weights=weights, minlength=dim).astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @classmethod
+    def build(cls, texts: Dict[str, str], dim: int = 512, fingerprint: str = '') -> 'VectorIndex':
+        ids = list(texts)
+        hashed = [cls._hash_features(extract_features(texts[chunk_id])) for chunk_id in ids]
+
+        document_frequency = np.zeros(FEATURE_BUCKETS, dtype=np.float32)
+        for hashes, _ in hashed:
+            document_frequency[np.unique(hashes % FEATURE_BUCKETS)] += 1
+        idf = np.log((1 + len(ids)) / (1 + document_frequency)).astype(np.float32) + 1.0
+
+        matrix = np.zeros((len(ids), dim), dtype=np.float32)
+        for row, (hashes, counts) in enumerate(hashed):
+            matrix[row] = cls._project(hashes, counts, idf, dim)
+        return cls(ids, matrix, idf, fingerprint)
+
+    # Cosine top-k over the whole matrix, or only over the given (start, end) row ranges
+    def search(self, query: str, k: int = 20, rows: Optional[List[Tuple[int, int]]] = None) -> List[Tuple[str, float]]:
+        if not self.ids:
+            return []
+        hashes, counts = self._hash_features(extract_features(query))
+        query_vector = self._project(hashes, counts, self.idf, self.dim)
+        if not query_vector.any():
+            return []
+
+        if rows is None:
+            row_ids = None
+            scores = self.matrix @ query_vector
+        else:
+            if not rows:
+                return []
+            row_ids = np.concatenate([np.arange(start, end) for start, end in rows])
+            scores = np.concatenate([self.matrix[start:end] @ query_vector for start, end in rows])
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i if row_ids is None else row_ids[i]], float(scores[i])) for i in top if scores[i] > 0]
+
+    # Writes a single artifact: magic, JSON header, then the aligned idf table and vector matrix
+    def save(self, path: str) -> None:
+        header = json.dumps({
+            'ids': self.ids,
+            'dim': self.dim,
+            'count': len(self.ids),
+            'fingerprint': self.fingerprint,
+        }).encode('utf-8')
+        preamble = len(MAGIC) + 8 + len(header)
+        padding = (-preamble) % ALIGNMENT
+
+        # A unique temporary file beside the target, so concurrent writers never share one and the rename stays atomic
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(MAGIC)
+                file.write(len(header).to_bytes(8, 'little'))
+                file.write(header)
+                file.write(b'\0' * padding)
+                file.write(np.ascontiguousarray(self.idf, dtype=np.float32).tobytes())
+                file.write(np.ascontiguousarray(self.matrix, dtype=np.float32).tobytes())
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    # Memory-maps a saved artifact so loading is constant time regardless of corpus size
+    @classmethod
+    def load(cls, path: str) -> 'VectorIndex':
+        with open(path, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a vector index")
+            header_length = int.from_bytes(file.read(8), 'little')
+            header = json.loads(file.read(header_length))
+
+        offset = len(MAGIC) + 8 + header_length
+        offset += (-offset) % ALIGNMENT
+        idf = np.memmap(path, dtype=np.float32, mode='r', offset=offset, shape=(FEATURE_BUCKETS,))
+        offset += FEATURE_BUCKETS * 4
+        shape = (header['count'], header['dim'])
+        matrix = np.memmap(path, dtype=np.float32, mode='r', offset=offset, shape=shape) if header['count'] else np.zeros(shape, dtype=np.float32)
+        return cls(header['ids'], matrix, idf, header['fingerprint'])
+
+# Returns the saved index when it was built from the same blob generations, otherwise builds and saves a new one
+def load_or_build(path: Optional[str], texts: Dict[str, str], fingerprint: str) -> VectorIndex:
+    if path and os.path.exists(path):
+        try:
+            index = VectorIndex.load(path)
+            if index.fingerprint == fingerprint:
+                return index
+        except Exception as e:
+            print(f"Error loading vector index from {path}: {e}")
+
+    index = VectorIndex.build(texts, fingerprint=fingerprint)
+    if path:
+        try:
+            index.save(path)
+        except Exception as e:
+            print(f"Error saving vector index to {path}: {e}")
+    return index
@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# Runs cache and index preloading in the background and tracks whether the instance is warm.
+# Required steps keep retrying with exponential backoff until they succeed; optional ones give up after max_attempts.
+class Warmup:
+    def __init__(self, retry_delay: float = 5.0, max_attempts: int = 3, max_retry_delay: float = 300.0):
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.max_retry_delay = max_retry_delay
+        self.tasks: List[Tuple[str, Callable[[], Any], bool]] = []
+        self.status: Dict[str, Dict[str, Any]] = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # Registers a warmup step; optional steps are reported but do not gate readiness
+    def add(self, name: str, func: Callable[[], Any], required: bool = True) -> None:
+        self.tasks.append((name, func, required))
+        self.status[name] = {'state': 'pending', 'required': required}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name='warmup', daemon=True)
+                self._thread.start()
+
+    def run_step(self, name: str, func: Callable[[], Any], attempt: int) -> bool:
+        self.status[name].update(state='running', attempts=attempt)
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            print(f"Warmup step {name} failed (attempt {attempt}): {e}")
+            self.status[name].update(state='error', error=str(e))
+            return False
+        self.status[name].update(state='ready', seconds=round(time.perf_counter() - start, 3))
+        self.status[name].pop('error', None)
+        return True
+
+    # Runs every step once, then retries the failed ones in rounds so one failing step does not hold back the rest
+    def run(self) -> None:
+        pending = list(self.tasks)
+        delay = self.retry_delay
+        attempt = 0
+        while pending:
+            attempt += 1
+            pending = [
+                (name, func, required) for name, func, required in pending
+                if not self.run_step(name, func, attempt) and (required or attempt < self.max_attempts)
+            ]
+            if pending:
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+    @property
+    def ready(self) -> bool:
+        return all(status['state'] == 'ready' for status in self.status.values() if status['required'])
+
+    def report(self) -> Dict[str, Any]:
+        return {'ready': self.ready, 'steps': {name: dict(status) for name, status in self.status.items()}}
@@ -61,6 +61,19 @@ export default function AutismSupportApp() {
     scrollToBottom();
   }, [messages]);
 
+  // Attach the user's location to "near me" questions so the backend can answer from its spatial index
+  const getCoordinates = (messageText) => new Promise((resolve) => {
+    if (!/\b(near|nearby|nearest|closest|around)\b/i.test(messageText) || !navigator.geolocation) {
+      resolve({});
+      return;
+    }
+    navigator.geolocation.getCurrentPosition(
+      (position) => resolve({ lat: position.coords.latitude, lng: position.coords.longitude }),
+      () => resolve({}),
+      { timeout: 5000 }
+    );
+  });
+
   // Handle sending a message by updating the message state
   const handleSendMessage = async (messageText) => {
     if (messageText.trim() === '') return;
@@ -70,20 +83,61 @@ export default function AutismSupportApp() {
     resetTranscript();
 
     try {
-      // Send message to backend and retrieve response
-      const response = await fetch('http://127.0.0.1:5000/chat', {
+      const coordinates = await getCoordinates(messageText);
+
+      // Stream the response from the backend as Server-Sent Events
+      const response = await fetch('http://127.0.0.1:5000/chat/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ query: messageText }),
+        body: JSON.stringify({ query: messageText, ...coordinates }),
       });
 
-      const data = await response.json();
-      const botMessage = data.response;
+      if (!response.ok || !response.body) {
+        throw new Error(`Request failed with status ${response.status}`);
+      }
+
+      // Add an empty bot message that is filled in as tokens arrive
+      setMessages(prev => [...prev, { text: '', isBot: true }]);
+      const appendToBotMessage = (text) => {
+        setMessages(prev => {
+          const updated = [...prev];
+          const last = updated[updated.length - 1];
+          updated[updated.length - 1] = { ...last, text: last.text + text };
+          return updated;
+        });
+      };
 
-      // Add bot response to the chat
-      setMessages(prev => [...prev, { text: botMessage, isBot: true }]);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let finished = false;
+
+      while (!finished) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const rawEvent of events) {
+          const lines = rawEvent.split('\n');
+          const eventType = lines.find(line => line.startsWith('event: '))?.slice(7) || 'message';
+          const dataLine = lines.find(line => line.startsWith('data: '));
+          const payload = dataLine ? JSON.parse(dataLine.slice(6)) : {};
+
+          if (eventType === 'done') {
+            finished = true;
+          } else if (eventType === 'error') {
+            appendToBotMessage(payload.error || "Sorry, something went wrong. Please try again later.");
+            finished = true;
+          } else if (payload.delta) {
+            appendToBotMessage(payload.delta);
+          }
+        }
+      }
     } catch (error) {
       console.error('Error communicating with the backend:', error);
       setMessages(prev => [
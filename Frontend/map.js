@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react'
-import { MapContainer, TileLayer, Marker, Popup, CircleMarker, useMap } from 'react-leaflet'
+import { MapContainer, TileLayer, Marker, Popup, CircleMarker, Tooltip, useMap, useMapEvents } from 'react-leaflet'
 import axios from 'axios'
 import 'leaflet/dist/leaflet.css'
 import L from 'leaflet'
@@ -148,33 +148,82 @@ function MapController({ searchLocation }) {
   return null
 }
 
+// Component that reports the visible bounds and zoom whenever the viewport changes
+function ViewportWatcher({ onViewportChange }) {
+  const map = useMapEvents({
+    moveend: () => onViewportChange(map),
+  })
+
+  useEffect(() => {
+    onViewportChange(map)
+  }, [map])
+
+  return null
+}
+
+// Component for a pre-aggregated cluster; clicking it zooms in towards its centroid
+function ClusterMarker({ cluster }) {
+  const map = useMap()
+  const radius = Math.min(40, 14 + Math.log2(cluster.count) * 4)
+
+  return (
+    <CircleMarker
+      center={[cluster.lat, cluster.lng]}
+      radius={radius}
+      fillColor="#7c3aed"
+      fillOpacity={0.6}
+      color="#ffffff"
+      weight={2}
+      eventHandlers={{
+        click: () => map.setView([cluster.lat, cluster.lng], Math.min(map.getZoom() + 2, map.getMaxZoom()))
+      }}
+    >
+      <Tooltip direction="center" permanent className="cluster-count">
+        {cluster.count}
+      </Tooltip>
+    </CircleMarker>
+  )
+}
+
 // Main component for rendering the map with resources and search functionality
 const ResourceMap = () => {
   const [resources, setResources] = useState([])
+  const [clusters, setClusters] = useState([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const [selectedResource, setSelectedResource] = useState(null)
   const [searchLocation, setSearchLocation] = useState(null)
   const [searchAddress, setSearchAddress] = useState(null)
+  const requestId = useRef(0)
 
-  useEffect(() => {
-    const fetchResources = async () => {
-      try {
-        const response = await axios.get('http://127.0.0.1:5000/api/resources')
-        if (response.data.status === 'success') {
-          setResources(response.data.data)
-        } else {
-          throw new Error(response.data.message)
-        }
-      } catch (err) {
+  // Fetch clusters and resources for the visible viewport only
+  const fetchViewport = async (map) => {
+    const bounds = map.getBounds()
+    const bbox = [bounds.getSouth(), bounds.getWest(), bounds.getNorth(), bounds.getEast()].join(',')
+    const currentRequest = ++requestId.current
+
+    try {
+      const response = await axios.get('http://127.0.0.1:5000/api/resources', {
+        params: { bbox, zoom: map.getZoom() }
+      })
+      if (currentRequest !== requestId.current) return
+      if (response.data.status === 'success') {
+        setResources(response.data.data)
+        setClusters(response.data.clusters || [])
+        setError(null)
+      } else {
+        throw new Error(response.data.message)
+      }
+    } catch (err) {
+      if (currentRequest === requestId.current) {
         setError(err.message || 'Failed to load resources')
-      } finally {
+      }
+    } finally {
+      if (currentRequest === requestId.current) {
         setLoading(false)
       }
     }
-
-    fetchResources()
-  }, [])
+  }
 
   // Handle search data and set the search location on the map
   const handleSearch = (searchData) => {
@@ -182,18 +231,8 @@ const ResourceMap = () => {
     setSearchAddress(searchData.address);
   }
 
-  // Show loading spinner when fetching data
-  if (loading) {
-    return (
-      <div className="flex items-center justify-center h-64">
-        <div className="animate-spin rounded-full h-12 w-12 border-t-2 border-b-2 border-blue-500"></div>
-      </div>
-    )
-  }
-
-  // Display error message if data fails to load
-  if (error) {
-    return (
+  // Error message shown above the map if data fails to load
+  const errorBanner = error && (
       <div className="bg-red-50 border-l-4 border-red-500 p-4 mb-4">
         <div className="flex">
           <div className="flex-shrink-0">
@@ -207,16 +246,22 @@ const ResourceMap = () => {
           </div>
         </div>
       </div>
-    )
-  }
+  )
 
   return (
     <div className="w-full flex-grow flex flex-col p-4">
       <h1 className="text-2xl font-bold mb-4">Food Banks in Connecticut</h1>
+      {errorBanner}
       
       <div className="flex-grow w-full rounded-lg overflow-hidden shadow-lg relative" 
         style={{ maxHeight: 'calc(100vh - 175px)' }}>
         <SearchControl onSearch={handleSearch} />
+        {/* Show loading spinner until the first viewport has loaded */}
+        {loading && (
+          <div className="absolute inset-0 z-[999] flex items-center justify-center bg-white/60">
+            <div className="animate-spin rounded-full h-12 w-12 border-t-2 border-b-2 border-blue-500"></div>
+          </div>
+        )}
         <MapContainer 
           center={DEFAULT_CENTER} 
           zoom={DEFAULT_ZOOM} 
@@ -228,6 +273,11 @@ const ResourceMap = () => {
           />
           
           <MapController searchLocation={searchLocation} />
+          <ViewportWatcher onViewportChange={fetchViewport} />
+
+          {clusters.map((cluster) => (
+            <ClusterMarker key={`${cluster.lat},${cluster.lng}`} cluster={cluster} />
+          ))}
           
           {/* Add the search marker */}
           <SearchMarker position={searchLocation} address={searchAddress} />
@@ -257,6 +307,15 @@ const ResourceMap = () => {
                           {resource.schedule}
                         </p>
                       )}
+                      {resource.occurrences?.length > 0 && (
+                        <div className="text-gray-600">
+                          <span className="font-medium">Upcoming: </span>
+                          {resource.occurrences.slice(0, 3).map((occurrence) => (
+                            new Date(occurrence.start).toLocaleString([], { weekday: 'short', month: 'short', day: 'numeric', hour: 'numeric', minute: '2-digit' })
+                          )).join(' · ')}
+                          {resource.occurrences.length > 3 && ` (+${resource.occurrences.length - 3} more)`}
+                        </div>
+                      )}
                       {resource.description && (
                         <p className="text-gray-700 mt-2">
                           <span className="font-medium">Description: </span>
@@ -1,8 +1,9 @@
-def scrape_and_upload_to_gcs1():
+def scrape_and_upload_to_gcs1(storage_client=None, session=None):
     from gcloud import storage
-    import json
-    from bs4 import BeautifulSoup
-    import requests
+    from html_extract import extract_records
+    from publish import publish_json
+    from http_cache import CachingSession, not_modified
+    session = session or CachingSession()
 
     # URL of the page to scrape
     url = 'https://childmind.org/guide/autism-spectrum-disorder-quick-guide/'
@@ -17,33 +18,18 @@ def scrape_and_upload_to_gcs1():
     }
 
     # Fetch the web page using requests with headers
-    response = requests.get(url, headers=headers)
+    response = session.get(url, headers=headers)
+    if not_modified(response):
+        print(f"{url} not modified since the last run, skipping")
+        return
     
     if response.status_code == 200:
-        # Parse the HTML content with BeautifulSoup
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Find the specific div by class
-        target_div = soup.find('div', class_='w-full mt-16 md:px-3 md:row-span-2 xl:row-span-1')
-
-        # Extract content from p, h2, h3, and ul tags within the specific div
-        data = []
-        if target_div:
-            for tag in target_div.find_all(['p', 'h2', 'h3', 'ul']):
-                tag_name = tag.name
-                tag_content = tag.get_text(strip=True)
-                
-                # Handle lists separately
-                if tag_name == 'ul':
-                    list_items = [li.get_text(strip=True) for li in tag.find_all('li')]
-                    tag_content = '\n'.join(list_items)
-                
-                data.append({
-                    'tag': tag_name,
-                    'content': tag_content
-                })
-        else:
+        # Parse only the div with this class, extracting content from its p, h2, h3, and ul tags
+        target = {'tag': 'div', 'class': 'w-full mt-16 md:px-3 md:row-span-2 xl:row-span-1'}
+        data = extract_records(response.content, target, tags=('p', 'h2', 'h3', 'ul'))
+        if data is None:
             print("Target div not found")
+            data = []
 
         # Debugging: Print the length and content of the data list
         print(f"Number of items extracted: {len(data)}")
@@ -51,22 +37,15 @@ def scrape_and_upload_to_gcs1():
         for item in data:
             print(item)
 
-        # Convert data to JSON format
-        data_json = json.dumps(data, ensure_ascii=False)
-
         # Google Cloud Storage Configuration
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(gcs_bucket_name)
-        blob = bucket.blob(gcs_blob_name)
+        storage_client = storage_client or storage.Client()
 
-        # Upload data to GCS
-        try:
-            blob.upload_from_string(data_json, content_type='application/json')
-            print("Data successfully uploaded to GCS")
-        except Exception as e:
-            print(f"Error uploading data to GCS: {e}")
+        # Upload data to GCS unless it is unchanged since the last run
+        return publish_json(storage_client.bucket(gcs_bucket_name), gcs_blob_name, data)
 
     else:
-        print(f"Failed to retrieve the page. Status code: {response.status_code}")
+        raise Exception(f"Failed to retrieve the page. Status code: {response.status_code}")
 
-scrape_and_upload_to_gcs1()
\ No newline at end of file
+if __name__ == '__main__':
+    from http_cache import run_standalone
+    run_standalone(scrape_and_upload_to_gcs1)
@@ -1,43 +1,34 @@
-def scrape_and_upload_to_gcs_4():
-    import json
-    from bs4 import BeautifulSoup
-    import requests
-    import pdfplumber
+def scrape_and_upload_to_gcs_4(storage_client=None, session=None):
+    from pdf_extract import iter_lines
     from gcloud import storage
-    from google.api_core.exceptions import GoogleAPIError
+    from publish import publish_json
+    from http_cache import CachingSession, not_modified
+    session = session or CachingSession()
 
     # Step 1: Download the PDF
     url = "https://portal.ct.gov/-/media/dph/cyshcn/ct-collaborative-autism-services-resource-directory.pdf"
-    response = requests.get(url)
-    
-    # Save to /tmp directory in Lambda
-    pdf_path = "/tmp/resource_directory.pdf"
-    with open(pdf_path, "wb") as file:
-        file.write(response.content)
+    response = session.get(url)
+    if not_modified(response):
+        print(f"{url} not modified since the last run, skipping")
+        return
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch {url}: {response.status_code}")
 
-    # Step 2: Extract Data from the PDF
-    def extract_text_from_pdf(pdf_path):
-        text_data = []
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                text_data.extend(page.extract_text().split('\n'))
-        return text_data
+    # Step 2: Extract Data from the PDF in memory, pages spread across processes and unchanged pages read from cache
+    pdf_text_lines = iter_lines(response.content)
 
-    pdf_text_lines = extract_text_from_pdf(pdf_path)
-
-    # Step 3: Parse Data
+    # Step 3: Parse Data, yielding each entry as soon as the lines that complete it arrive
     def parse_text(lines):
-        parsed_data = []
         entry = {}
         for line in lines:
             if line.strip() == '':  # Assuming a blank line indicates a new entry
                 if entry:
-                    parsed_data.append(entry)
+                    yield entry
                     entry = {}
             else:
                 if "Organization:" in line:
                     if entry:  # Save the previous entry if it exists
-                        parsed_data.append(entry)
+                        yield entry
                     entry = {"organization": line.replace("Organization:", "").strip()}
                 elif "Contact:" in line:
                     entry["contact_info"] = line.replace("Contact:", "").strip()
@@ -50,30 +41,20 @@ def scrape_and_upload_to_gcs_4():
                     else:
                         entry["additional_info"] = line.strip()
         if entry:
-            parsed_data.append(entry)
-        return parsed_data
-
-    structured_data = parse_text(pdf_text_lines)
+            yield entry
 
-    # Convert structured data to JSON
-    json_data = json.dumps(structured_data, ensure_ascii=False, indent=4)
+    structured_data = list(parse_text(pdf_text_lines))
 
     # Step 4: Google Cloud Storage (GCS) Configuration
     gcs_bucket_name = 'beacon-data-bucket'
     gcs_key = 'autism_services_resource_directory.json'
 
     # Initialize Google Cloud Storage client
-    storage_client = storage.Client()
+    storage_client = storage_client or storage.Client()
 
-    try:
-        # Upload JSON data to GCS
-        bucket = storage_client.get_bucket(gcs_bucket_name)
-        blob = bucket.blob(gcs_key)
-        blob.upload_from_string(json_data, content_type='application/json')
-        print("Data successfully uploaded to GCS")
-    except GoogleAPIError as e:
-        print(f"Failed to upload to GCS: {e}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+    # Upload JSON data to GCS unless it is unchanged since the last run
+    return publish_json(storage_client.get_bucket(gcs_bucket_name), gcs_key, structured_data, indent=4)
 
-scrape_and_upload_to_gcs_4()
\ No newline at end of file
+if __name__ == '__main__':
+    from http_cache import run_standalone
+    run_standalone(scrape_and_upload_to_gcs_4)
@@ -1,13 +1,18 @@
-def scrape_and_upload_to_gcs_6():
-    import json
+def scrape_and_upload_to_gcs_6(storage_client=None, session=None):
     from bs4 import BeautifulSoup
-    import requests
     from gcloud import storage
-    from google.api_core.exceptions import GoogleAPIError
+    from publish import publish_json
+    from http_cache import CachingSession, not_modified
+    session = session or CachingSession()
 
     # Step 1: Fetch the web page
     url = 'https://www.healthline.com/health/autism#support'
-    response = requests.get(url)
+    response = session.get(url)
+    if not_modified(response):
+        print(f"{url} not modified since the last run, skipping")
+        return
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch {url}: {response.status_code}")
     html_content = response.text
 
     # Step 2: Parse the HTML
@@ -23,25 +28,16 @@ def scrape_and_upload_to_gcs_6():
             'content': div_content
         })
 
-    # Convert data to JSON format
-    data_json = json.dumps(data, ensure_ascii=False, indent=4)
-
     # Google Cloud Storage (GCS) Configuration
     gcs_bucket_name = 'beacon-data-bucket'
     gcs_key = 'autism_support.json'
 
     # Initialize Google Cloud Storage client
-    storage_client = storage.Client()
-
-    try:
-        # Upload JSON data to GCS
-        bucket = storage_client.get_bucket(gcs_bucket_name)
-        blob = bucket.blob(gcs_key)
-        blob.upload_from_string(data_json, content_type='application/json')
-        print("Data successfully uploaded to GCS")
-    except GoogleAPIError as e:
-        print(f"Failed to upload to GCS: {e}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
-scrape_and_upload_to_gcs_6()
\ No newline at end of file
+    storage_client = storage_client or storage.Client()
+
+    # Upload JSON data to GCS unless it is unchanged since the last run
+    return publish_json(storage_client.get_bucket(gcs_bucket_name), gcs_key, data, indent=4)
+
+if __name__ == '__main__':
+    from http_cache import run_standalone
+    run_standalone(scrape_and_upload_to_gcs_6)
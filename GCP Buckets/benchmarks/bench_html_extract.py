@@ -0,0 +1,189 @@
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from html_extract import element_records, extract_records, find_target, find_targets, parse_targets
+
+NIMH_TARGET = {'tag': 'div', 'id': 'main_content', 'class': 'areanav-true sidebar-true'}
+GUIDE_TARGET = {'tag': 'div', 'class': 'w-full mt-16 md:px-3 md:row-span-2 xl:row-span-1'}
+CDC_TARGETS = [
+    {'tag': 'div', 'class': 'dfe-section', 'attrs': {'data-section': 'cdc_data_surveillance_section_1'}},
+    {'tag': 'div', 'class': 'dfe-section', 'attrs': {'data-section': 'cdc_data_surveillance_section_2'}},
+]
+DIAPER_TARGETS = [
+    {'tag': 'div', 'class': 'et_pb_column et_pb_column_2_3 et_pb_column_1 et_pb_css_mix_blend_mode_passthrough et-last-child'},
+    {'tag': 'div', 'class': 'et_pb_column et_pb_column_2_3 et_pb_column_2 et_pb_css_mix_blend_mode_passthrough'},
+    {'tag': 'div', 'class': 'et_pb_column et_pb_column_2_3 et_pb_column_5 et_pb_css_mix_blend_mode_passthrough et-last-child'},
+]
+
+URLS = {
+    'nimh_asd': 'https://www.nimh.nih.gov/health/topics/autism-spectrum-disorders-asd',
+    'asd_guide': 'https://childmind.org/guide/autism-spectrum-disorder-quick-guide/',
+    'cdc_autism_data': 'https://www.cdc.gov/autism/data-research/?CDC_AAref_Val=https://www.cdc.gov/ncbddd/autism/data.html',
+    'diaper_connections': 'https://www.thediaperbank.org/diaper-connections/',
+}
+
+# The original whole-page parses, kept here as the baseline
+def legacy_records(element, tags) -> List[Dict[str, str]]:
+    records = []
+    for tag in element.find_all(tags):
+        if tag.name == 'a':
+            records.append({'tag': 'a', 'content': tag.get_text(strip=True), 'href': tag.get('href', '')})
+            continue
+        content = tag.get_text(strip=True)
+        if tag.name == 'ul':
+            content = '\n'.join(li.get_text(strip=True) for li in tag.find_all('li'))
+        records.append({'tag': tag.name, 'content': content})
+    return records
+
+def legacy_nimh(html: str) -> Optional[List[Dict[str, str]]]:
+    soup = BeautifulSoup(html, 'html.parser')
+    target = soup.find('div', id='main_content', class_='areanav-true sidebar-true')
+    return legacy_records(target, ['p', 'h2', 'h3', 'ul', 'a']) if target else None
+
+def legacy_guide(html: str) -> Optional[List[Dict[str, str]]]:
+    soup = BeautifulSoup(html, 'html.parser')
+    target = soup.find('div', class_='w-full mt-16 md:px-3 md:row-span-2 xl:row-span-1')
+    return legacy_records(target, ['p', 'h2', 'h3', 'ul']) if target else None
+
+def legacy_cdc(html: str) -> List[Any]:
+    soup = BeautifulSoup(html, 'html.parser')
+    sections = []
+    for target in CDC_TARGETS:
+        div = soup.find('div', class_='dfe-section', attrs=target['attrs'])
+        sections.append(legacy_records(div, ['p', 'h2', 'h3', 'ul', 'a']) if div else None)
+    return sections
+
+def legacy_diaper(html: str) -> List[Dict[str, str]]:
+    soup = BeautifulSoup(html, 'html.parser')
+    return [{'text': div.get_text(strip=True)} for target in DIAPER_TARGETS for div in soup.find_all('div', class_=target['class'])]
+
+def strained(parser: str) -> Dict[str, Callable[[str], Any]]:
+    def cdc(html: str) -> List[Any]:
+        soup = parse_targets(html, CDC_TARGETS, parser)
+        return [element_records(div) if div else None for div in (find_target(soup, target) for target in CDC_TARGETS)]
+
+    def diaper(html: str) -> List[Dict[str, str]]:
+        soup = parse_targets(html, DIAPER_TARGETS, parser)
+        return [{'text': div.get_text(strip=True)} for target in DIAPER_TARGETS for div in find_targets(soup, target)]
+
+    return {
+        'nimh_asd': lambda html: extract_records(html, NIMH_TARGET, parser=parser),
+        'asd_guide': lambda html: extract_records(html, GUIDE_TARGET, tags=('p', 'h2', 'h3', 'ul'), parser=parser),
+        'cdc_autism_data': cdc,
+        'diaper_connections': diaper,
+    }
+
+LEGACY = {'nimh_asd': legacy_nimh, 'asd_guide': legacy_guide, 'cdc_autism_data': legacy_cdc, 'diaper_connections': legacy_diaper}
+
+def class_attr(target: Dict[str, Any]) -> str:
+    attrs = ''.join(f' {key}="{value}"' for key, value in target.get('attrs', {}).items())
+    element_id = f' id="{target["id"]}"' if 'id' in target else ''
+    return f'{element_id} class="{target["class"]}"{attrs}'
+
+# Builds a page shaped like the real ones: heavy head and navigation, a few target blocks and a long footer
+def synthetic_page(source: str, rng: random.Random, size: int) -> str:
+    words = ['autism', 'support', 'children', 'families', 'services', 'diagnosis', 'screening', 'therapy', 'Connecticut', 'diapers', 'early', 'signs']
+
+    def sentence(count: int = 14) -> str:
+        return ' '.join(rng.choice(words) for _ in range(count)).capitalize() + '.'
+
+    def content_block() -> str:
+        parts = []
+        for index in range(size):
+            parts.append(f'<h2>{sentence(4)}</h2><p>{sentence()} <a href="/page/{index}">{sentence(3)}</a> {sentence()}</p>')
+            parts.append('<ul>' + ''.join(f'<li>{sentence(6)}</li>' for _ in range(4)) + '</ul>')
+            parts.append(f'<h3>{sentence(3)}</h3><p><strong>{sentence(5)}</strong> {sentence()}</p>')
+        return ''.join(parts)
+
+    head = '<head><title>Fixture</title>' + ''.join(
+        f'<script>var config{index} = {{"key": "{sentence(3)}", "values": [1, 2, 3]}};</script><style>.c{index} {{ color: #333; margin: 0 }}</style>'
+        for index in range(40)
+    ) + '</head>'
+    nav = '<nav class="site-nav"><ul>' + ''.join(f'<li class="menu-item"><a href="/nav/{index}">{sentence(2)}</a></li>' for index in range(size * 12)) + '</ul></nav>'
+    footer = '<footer>' + ''.join(f'<div class="footer-col"><p>{sentence()}</p><a href="/f/{index}">{sentence(2)}</a></div>' for index in range(size * 6)) + '</footer>'
+
+    if source == 'nimh_asd':
+        body = f'<div{class_attr(NIMH_TARGET)}>{content_block()}</div>'
+    elif source == 'asd_guide':
+        body = f'<div class="w-full"><div{class_attr(GUIDE_TARGET)}>{content_block()}</div></div>'
+    elif source == 'cdc_autism_data':
+        table = '<table><tr><th>Year</th><th>Prevalence</th></tr>' + ''.join(f'<tr><td>{2000 + i}</td><td>1 in {150 - i * 4}</td></tr>' for i in range(20)) + '</table>'
+        body = f'<div{class_attr(CDC_TARGETS[0])}>{content_block()}</div><div class="dfe-section" data-section="other">{content_block()}</div><div{class_attr(CDC_TARGETS[1])}>{table}</div>'
+    else:
+        body = ''.join(f'<div class="et_pb_row"><div{class_attr(target)}>{content_block()}</div><div class="et_pb_column et_pb_column_1_3">{sentence()}</div></div>' for target in DIAPER_TARGETS)
+    filler = ''.join(f'<section class="promo"><div class="card"><p>{sentence()}</p><img src="/img/{index}.png" alt=""></div></section>' for index in range(size * 4))
+    return f'<!DOCTYPE html><html>{head}<body>{nav}<main>{filler}{body}{filler}</main>{footer}</body></html>'
+
+def load_fixtures(directory: Optional[str], size: int, seed: int) -> Dict[str, str]:
+    rng = random.Random(seed)
+    fixtures = {}
+    for source in URLS:
+        path = os.path.join(directory, f"{source}.html") if directory else None
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8', errors='replace') as file:
+                fixtures[source] = file.read()
+        else:
+            fixtures[source] = synthetic_page(source, rng, size)
+    return fixtures
+
+def save_fixtures(directory: str) -> None:
+    import requests
+    os.makedirs(directory, exist_ok=True)
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0 Safari/537.36'}
+    for source, url in URLS.items():
+        response = requests.get(url, headers=headers, timeout=30)
+        with open(os.path.join(directory, f"{source}.html"), 'w', encoding='utf-8') as file:
+            file.write(response.text)
+        print(f"saved {source}.html ({len(response.text):,} chars, status {response.status_code})")
+
+def run(label: str, func: Callable[[str], Any], html: str, repeat: int, baseline: Optional[float] = None) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        best = min(best, time.perf_counter() - start)
+    speedup = f"  {baseline / best:5.1f}x" if baseline else ''
+    print(f"  {label:<28} {best * 1000:9.1f} ms{speedup}")
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark whole-page scraper parsing against strained partial-tree parsing')
+    parser.add_argument('--fixtures', help='directory of saved <source>.html pages; missing pages are generated')
+    parser.add_argument('--save-fixtures', metavar='DIR', help='download the live pages into DIR and exit')
+    parser.add_argument('--size', type=int, default=40, help='content blocks per generated page')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    if args.save_fixtures:
+        save_fixtures(args.save_fixtures)
+        return
+
+    backends = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        backends.append('lxml')
+    except ImportError:
+        print('lxml not installed; skipping the lxml backend')
+
+    fixtures = load_fixtures(args.fixtures, args.size, args.seed)
+    for source, html in fixtures.items():
+        print(f"{source} ({len(html) / 1024:,.0f} KiB)")
+        expected = LEGACY[source](html)
+        baseline = run('whole page (html.parser)', LEGACY[source], html, args.repeat)
+        for backend in backends:
+            extract = strained(backend)[source]
+            result = extract(html)
+            if result != expected:
+                print(f"  records differ from the baseline with {backend}")
+            run(f"strained ({backend})", extract, html, args.repeat, baseline)
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,9 @@
-def scrape_and_upload_to_gcs_7():
-    import json
+def scrape_and_upload_to_gcs_7(storage_client=None, session=None):
     from bs4 import BeautifulSoup
-    import requests
     from gcloud import storage
-    from google.api_core.exceptions import GoogleAPIError
+    from publish import publish_json
+    from http_cache import CachingSession, not_modified
+    session = session or CachingSession()
 
     # List of URLs to scrape
     URLs = [
@@ -41,14 +41,30 @@ def scrape_and_upload_to_gcs_7():
             'phone_number': phone_number
         }
 
+    # Fetch every page first; the listing is only re-parsed when one of them changed
+    responses = {}
+    for URL in URLs:
+        print(f'Scraping {URL}')
+        try:
+            responses[URL] = session.get(URL, headers=HEADERS)
+        except Exception as e:
+            print(f'An error occurred while scraping {URL}: {e}')
+
+    if len(responses) == len(URLs) and all(not_modified(response) for response in responses.values()):
+        print("Program pages not modified since the last run, skipping")
+        return
+
+    # Keep the last published listing rather than replacing it with a partial one
+    failed = [URL for URL in URLs if URL not in responses or responses[URL].status_code != 200]
+    if failed:
+        raise Exception(f"Failed to retrieve {', '.join(failed)}")
+
     # Data extraction
     all_programs = []
 
     # Iterate over each URL
-    for URL in URLs:
-        print(f'Scraping {URL}')
+    for URL, response in responses.items():
         try:
-            response = requests.get(URL, headers=HEADERS)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -74,25 +90,16 @@ def scrape_and_upload_to_gcs_7():
         except Exception as e:
             print(f'An error occurred while scraping {URL}: {e}')
 
-    # Convert data to JSON format
-    json_data = json.dumps(all_programs, ensure_ascii=False, indent=4)
-
     # Google Cloud Storage (GCS) Configuration
     gcs_bucket_name = 'beacon-data-bucket'
     gcs_file_name = 'birth_to_3_programs.json'
 
     # Initialize Google Cloud Storage client
-    storage_client = storage.Client()
-
-    try:
-        # Upload JSON data to GCS
-        bucket = storage_client.get_bucket(gcs_bucket_name)
-        blob = bucket.blob(gcs_file_name)
-        blob.upload_from_string(json_data, content_type='application/json')
-        print("Data successfully uploaded to GCS")
-    except GoogleAPIError as e:
-        print(f"Failed to upload to GCS: {e}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
-scrape_and_upload_to_gcs_7()
\ No newline at end of file
+    storage_client = storage_client or storage.Client()
+
+    # Upload JSON data to GCS unless it is unchanged since the last run
+    return publish_json(storage_client.get_bucket(gcs_bucket_name), gcs_file_name, all_programs, indent=4)
+
+if __name__ == '__main__':
+    from http_cache import run_standalone
+    run_standalone(scrape_and_upload_to_gcs_7)
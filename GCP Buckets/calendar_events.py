@@ -1,8 +1,7 @@
-def scrape_and_upload_to_gcs_8():
-    import json
+def scrape_and_upload_to_gcs_8(storage_client=None, session=None):
     from googleapiclient.discovery import build
     from gcloud import storage
-    from google.api_core.exceptions import GoogleAPIError
+    from publish import publish_json
     from datetime import datetime
 
     # Configuration
@@ -34,25 +33,15 @@ def scrape_and_upload_to_gcs_8():
         }
         data.append(event_data)
 
-    # Convert data to JSON format
-    json_data = json.dumps(data, ensure_ascii=False, indent=4)
-
     # Google Cloud Storage (GCS) Configuration
     gcs_bucket_name = 'beacon-data-bucket'
     gcs_file_name = 'calendar_events.json'
 
     # Initialize Google Cloud Storage client
-    storage_client = storage.Client()
-
-    try:
-        # Upload JSON data to GCS
-        bucket = storage_client.get_bucket(gcs_bucket_name)
-        blob = bucket.blob(gcs_file_name)
-        blob.upload_from_string(json_data, content_type='application/json')
-        print("Data successfully uploaded to GCS")
-    except GoogleAPIError as e:
-        print(f"Failed to upload to GCS: {e}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
-scrape_and_upload_to_gcs_8()
+    storage_client = storage_client or storage.Client()
+
+    # Upload JSON data to GCS unless it is unchanged since the last run
+    return publish_json(storage_client.get_bucket(gcs_bucket_name), gcs_file_name, data, indent=4)
+
+if __name__ == '__main__':
+    scrape_and_upload_to_gcs_8()
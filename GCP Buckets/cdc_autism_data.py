@@ -1,41 +1,26 @@
-def scrape_and_upload_to_gcs_9():
-    import json
-    from bs4 import BeautifulSoup
-    import requests
+def scrape_and_upload_to_gcs_9(storage_client=None, session=None):
+    from html_extract import element_records, find_target, parse_targets
     from gcloud import storage
-    from google.api_core.exceptions import GoogleAPIError
+    from publish import publish_json
+    from http_cache import CachingSession, not_modified
+    session = session or CachingSession()
 
     # Fetch the web page
     url = 'https://www.cdc.gov/autism/data-research/?CDC_AAref_Val=https://www.cdc.gov/ncbddd/autism/data.html'
-    response = requests.get(url)
+    response = session.get(url)
+    if not_modified(response):
+        print(f"{url} not modified since the last run, skipping")
+        return
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch {url}: {response.status_code}")
     html_content = response.text
 
-    # Parse the HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Sections to extract
+    section1_target = {'tag': 'div', 'class': 'dfe-section', 'attrs': {'data-section': 'cdc_data_surveillance_section_1'}}
+    section2_target = {'tag': 'div', 'class': 'dfe-section', 'attrs': {'data-section': 'cdc_data_surveillance_section_2'}}
 
-    # Function to extract text content from a given div section
-    def extract_text_content(section_div):
-        content = []
-        for tag in section_div.find_all(['p', 'h2', 'h3', 'ul', 'a']):
-            tag_name = tag.name
-            if tag_name == 'a':
-                tag_content = tag.get_text(strip=True)
-                href = tag.get('href', '')
-                content.append({
-                    'tag': tag_name,
-                    'content': tag_content,
-                    'href': href
-                })
-            else:
-                tag_content = tag.get_text(strip=True)
-                if tag_name == 'ul':
-                    list_items = [li.get_text(strip=True) for li in tag.find_all('li')]
-                    tag_content = '\n'.join(list_items)
-                content.append({
-                    'tag': tag_name,
-                    'content': tag_content
-                })
-        return content
+    # Parse only those sections of the HTML
+    soup = parse_targets(html_content, [section1_target, section2_target])
 
     # Function to extract table data from a given div section
     def extract_table_content(section_div):
@@ -54,15 +39,15 @@ def scrape_and_upload_to_gcs_9():
 
     # Find and extract data from the specified sections
     data = []
-    section1_div = soup.find('div', class_='dfe-section', attrs={'data-section': 'cdc_data_surveillance_section_1'})
+    section1_div = find_target(soup, section1_target)
     if section1_div:
-        section1_content = extract_text_content(section1_div)
+        section1_content = element_records(section1_div)
         data.append({
             'section': 'cdc_data_surveillance_section_1',
             'content': section1_content
         })
 
-    section2_div = soup.find('div', class_='dfe-section', attrs={'data-section': 'cdc_data_surveillance_section_2'})
+    section2_div = find_target(soup, section2_target)
     if section2_div:
         section2_content = extract_table_content(section2_div)
         data.append({
@@ -76,25 +61,16 @@ def scrape_and_upload_to_gcs_9():
     for section in data:
         print(section)
 
-    # Convert data to JSON format
-    data_json = json.dumps(data, ensure_ascii=False, indent=4)
-
     # Google Cloud Storage (GCS) Configuration
     gcs_bucket_name = 'beacon-data-bucket'
     gcs_file_name = 'cdc_autism_data.json'
 
     # Initialize Google Cloud Storage client
-    storage_client = storage.Client()
+    storage_client = storage_client or storage.Client()
 
-    try:
-        # Upload JSON data to GCS
-        bucket = storage_client.get_bucket(gcs_bucket_name)
-        blob = bucket.blob(gcs_file_name)
-        blob.upload_from_string(data_json, content_type='application/json')
-        print("Data successfully uploaded to GCS")
-    except GoogleAPIError as e:
-        print(f"Failed to upload to GCS: {e}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+    # Upload JSON data to GCS unless it is unchanged since the last run
+    return publish_json(storage_client.get_bucket(gcs_bucket_name), gcs_file_name, data, indent=4)
 
-scrape_and_upload_to_gcs_9()
\ No newline at end of file
+if __name__ == '__main__':
+    from http_cache import run_standalone
+    run_standalone(scrape_and_upload_to_gcs_9)
@@ -0,0 +1,81 @@
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Tags the content scrapers turn into {'tag', 'content'} records, plus 'href' for links
+RECORD_TAGS = ('p', 'h2', 'h3', 'ul', 'a')
+
+# Picks lxml when it is installed since it parses pages several times faster than html.parser
+def default_parser():
+    configured = os.environ.get('SCRAPER_HTML_PARSER')
+    if configured:
+        return configured
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+HTML_PARSER = default_parser()
+
+# A target spec names the element a scraper wants, e.g.
+#   {'tag': 'div', 'id': 'main_content', 'class': 'areanav-true sidebar-true'}
+#   {'tag': 'div', 'class': 'dfe-section', 'attrs': {'data-section': 'cdc_data_surveillance_section_1'}}
+# 'class' follows BeautifulSoup's class_ rules: one name matches any element carrying it, several must match exactly.
+def target_attrs(target):
+    attrs = dict(target.get('attrs', {}))
+    if 'id' in target:
+        attrs['id'] = target['id']
+    if 'class' in target:
+        attrs['class'] = target['class']
+    return attrs
+
+def attr_matches(key, expected, value):
+    if value is None:
+        return False
+    values = value.split() if isinstance(value, str) else list(value)
+    if key == 'class':
+        return ' '.join(values) == expected if ' ' in expected.strip() else expected in values
+    return (value if isinstance(value, str) else ' '.join(values)) == expected
+
+# Builds a parse-time filter that keeps only the subtrees any of the targets could match.
+# Attributes not shared by every target are left out, so the filter may keep more than needed but never less.
+def strainer(targets):
+    targets = list(targets)
+    names = sorted({target['tag'] for target in targets})
+    specs = [target_attrs(target) for target in targets]
+    shared = set.intersection(*(set(spec) for spec in specs)) if specs else set()
+
+    def matcher(key):
+        expected = {spec[key] for spec in specs}
+        return lambda value: any(attr_matches(key, item, value) for item in expected)
+
+    return SoupStrainer(names, attrs={key: matcher(key) for key in shared})
+
+# Parses only the parts of `html` that the targets select; pass the result to find_target/find_targets
+def parse_targets(html, targets, parser=HTML_PARSER):
+    return BeautifulSoup(html, parser, parse_only=strainer(targets))
+
+def find_target(soup, target):
+    return soup.find(target['tag'], attrs=target_attrs(target))
+
+def find_targets(soup, target):
+    return soup.find_all(target['tag'], attrs=target_attrs(target))
+
+# Flattens an element into the records the scrapers store: list items joined by newlines, links with their href
+def element_records(element, tags=RECORD_TAGS):
+    records = []
+    for tag in element.find_all(list(tags)):
+        content = tag.get_text(strip=True)
+        if tag.name == 'a':
+            records.append({'tag': 'a', 'content': content, 'href': tag.get('href', '')})
+            continue
+        if tag.name == 'ul':
+            content = '\n'.join(li.get_text(strip=True) for li in tag.find_all('li'))
+        records.append({'tag': tag.name, 'content': content})
+    return records
+
+# Records for the first element matching `target`, or None when the page has no such element
+def extract_records(html, target, tags=RECORD_TAGS, parser=HTML_PARSER):
+    element = find_target(parse_targets(html, [target], parser), target)
+    return element_records(element, tags) if element is not None else None
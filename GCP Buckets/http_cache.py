@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import threading
+
+import requests
+
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache'))
+
+# True when the response was answered 304 and its body was replayed from the local cache
+def not_modified(response):
+    return getattr(response, 'not_modified', False)
+
+# requests.Session that revalidates GET requests with the ETag/Last-Modified of the last response stored for each URL.
+# A 304 comes back as the stored 200 response with `not_modified` set, so callers can skip work or still read the body.
+# New responses are only staged until `commit()`, so a scrape that fails before publishing refetches in full next run.
+class CachingSession(requests.Session):
+    def __init__(self, cache_dir=HTTP_CACHE_DIR):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + '.json'), os.path.join(self.cache_dir, key + '.body')
+
+    def _load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+            with open(body_path, 'rb') as file:
+                body = file.read()
+        except (OSError, ValueError):
+            return None, None
+        return (meta, body) if meta.get('url') == url else (None, None)
+
+    def _stage(self, url, response):
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type'),
+            'encoding': response.encoding,
+        }
+        self._staged()[url] = (meta, response.content)
+
+    def _staged(self):
+        if not hasattr(self._local, 'staged'):
+            self._local.staged = {}
+        return self._local.staged
+
+    def _write(self, url, meta, body):
+        meta_path, body_path = self._paths(url)
+        # Body first and both via rename, so a reader never pairs new validators with an old body
+        with self._lock:
+            for path, data, mode in ((body_path, body, 'wb'), (meta_path, json.dumps(meta), 'w')):
+                with open(path + '.tmp', mode) as file:
+                    file.write(data)
+                os.replace(path + '.tmp', path)
+
+    # Starts recording the fetches made by the calling thread, for `fetches()`, `commit()` and `discard()`
+    def begin(self):
+        self._local.fetches = []
+        self._local.staged = {}
+
+    def fetches(self):
+        return getattr(self._local, 'fetches', [])
+
+    # Persists the responses the calling thread fetched since `begin()`; call once their content has been published
+    def commit(self):
+        staged = self._staged()
+        for url, (meta, body) in staged.items():
+            self._write(url, meta, body)
+        staged.clear()
+
+    # Drops the responses staged since `begin()` without persisting them
+    def discard(self):
+        self._staged().clear()
+
+    def request(self, method, url, *args, **kwargs):
+        headers = dict(kwargs.pop('headers', None) or {})
+        conditional = (
+            self.cache_dir
+            and method.upper() == 'GET'
+            and not any(name.lower() in ('if-none-match', 'if-modified-since') for name in headers)
+        )
+        meta, body = self._load(url) if conditional else (None, None)
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = super().request(method, url, *args, headers=headers, **kwargs)
+        response.not_modified = False
+        staged = False
+        if meta and response.status_code == 304:
+            response.status_code = 200
+            response._content = body
+            response.encoding = meta.get('encoding')
+            if meta.get('content_type'):
+                response.headers['Content-Type'] = meta['content_type']
+            response.not_modified = True
+        elif conditional and response.status_code == 200 and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            self._stage(url, response)
+            staged = True
+
+        if hasattr(self._local, 'fetches'):
+            self._local.fetches.append({'url': url, 'not_modified': response.not_modified, 'staged': staged})
+        return response
+
+# Runs one scraper on its own session and keeps the fetched validators only if the scrape succeeds
+def run_standalone(scrape):
+    session = CachingSession()
+    session.begin()
+    result = scrape(session=session)
+    session.commit()
+    return result
@@ -0,0 +1,99 @@
+import hashlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pdfplumber
+from pdfminer.pdftypes import resolve1
+
+PDF_TEXT_CACHE_DIR = os.getenv('PDF_TEXT_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.pdf_text_cache'))
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', '0')) or os.cpu_count() or 1
+
+# Each worker process opens the document once and then extracts whichever pages it is handed
+_worker_pdf = None
+
+def _open_in_worker(pdf_bytes):
+    global _worker_pdf
+    _worker_pdf = pdfplumber.open(io.BytesIO(pdf_bytes))
+
+def _extract_in_worker(page_number):
+    return page_number, _worker_pdf.pages[page_number].extract_text() or ''
+
+# Hash of a page's content streams, which change whenever the text drawn on the page does
+def page_hash(page):
+    digest = hashlib.sha256()
+    for stream in page.page_obj.contents:
+        stream = resolve1(stream)
+        if stream is not None:
+            digest.update(stream.get_data())
+    return digest.hexdigest()
+
+def _cache_path(cache_dir, digest):
+    return os.path.join(cache_dir, digest + '.txt')
+
+def _read_cached(cache_dir, digest):
+    try:
+        with open(_cache_path(cache_dir, digest), 'r', encoding='utf-8') as file:
+            return file.read()
+    except OSError:
+        return None
+
+def _write_cached(cache_dir, digest, text):
+    path = _cache_path(cache_dir, digest)
+    with open(path + '.tmp', 'w', encoding='utf-8') as file:
+        file.write(text)
+    os.replace(path + '.tmp', path)
+
+# Yields (page_number, text) as pages finish, in whatever order that happens
+def extract_pages(pdf_bytes, page_numbers, workers=PDF_WORKERS):
+    if workers <= 1 or len(page_numbers) <= 1:
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            for page_number in page_numbers:
+                yield page_number, pdf.pages[page_number].extract_text() or ''
+        return
+
+    # Spawned rather than forked since scrapers run on the runner's threads
+    executor = ProcessPoolExecutor(
+        max_workers=min(workers, len(page_numbers)),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_open_in_worker,
+        initargs=(pdf_bytes,),
+    )
+    try:
+        for future in as_completed([executor.submit(_extract_in_worker, page_number) for page_number in page_numbers]):
+            yield future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+# Yields the text of every page in page order, reading unchanged pages from the cache and extracting the rest.
+# Each page is yielded as soon as it and every page before it are available.
+def iter_page_texts(pdf_bytes, cache_dir=PDF_TEXT_CACHE_DIR, workers=PDF_WORKERS):
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        digests = [page_hash(page) for page in pdf.pages]
+    texts = {}
+    if cache_dir:
+        for page_number, digest in enumerate(digests):
+            cached = _read_cached(cache_dir, digest)
+            if cached is not None:
+                texts[page_number] = cached
+    missing = [page_number for page_number in range(len(digests)) if page_number not in texts]
+    print(f"PDF has {len(digests)} pages, {len(digests) - len(missing)} cached, extracting {len(missing)}")
+
+    extracted = extract_pages(pdf_bytes, missing, workers)
+    try:
+        for page_number in range(len(digests)):
+            while page_number not in texts:
+                finished, text = next(extracted)
+                texts[finished] = text
+                if cache_dir:
+                    _write_cached(cache_dir, digests[finished], text)
+            yield texts.pop(page_number)
+    finally:
+        extracted.close()
+
+def iter_lines(pdf_bytes, cache_dir=PDF_TEXT_CACHE_DIR, workers=PDF_WORKERS):
+    for text in iter_page_texts(pdf_bytes, cache_dir, workers):
+        yield from text.split('\n')
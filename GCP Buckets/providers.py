@@ -1,10 +1,14 @@
-def scrape_and_upload_to_gcs_19():
-    import requests
+def scrape_and_upload_to_gcs_19(storage_client=None, session=None):
     from gcloud import storage
-    import json
+    from publish import publish_json
+    from http_cache import CachingSession, not_modified
+    session = session or CachingSession()
     # Step 1: Fetch Data
     url = 'https://www.211childcare.org/providers.json'
-    response = requests.get(url)
+    response = session.get(url)
+    if not_modified(response):
+        print(f"{url} not modified since the last run, skipping")
+        return
     
     if response.status_code == 200:
         data = response.json()
@@ -12,15 +16,13 @@ def scrape_and_upload_to_gcs_19():
         raise Exception(f"Failed to fetch data: {response.status_code}")
     
     # Step 2: Upload to Google Cloud Storage
-    client = storage.Client()
+    client = storage_client or storage.Client()
     bucket_name = 'beacon-data-bucket'  # Your bucket name
     destination_blob_name = 'providers.json'
     
-    bucket = client.get_bucket(bucket_name)
-    json_data = json.dumps(data)
-    blob = bucket.blob(destination_blob_name)
-    blob.upload_from_string(json_data, content_type='application/json')
+    # Upload only when the data changed since the last run
+    return publish_json(client.get_bucket(bucket_name), destination_blob_name, data)
     
-    print(f"Data successfully uploaded to {bucket_name}/{destination_blob_name}")
-    
-scrape_and_upload_to_gcs_19()
\ No newline at end of file
+if __name__ == '__main__':
+    from http_cache import run_standalone
+    run_standalone(scrape_and_upload_to_gcs_19)
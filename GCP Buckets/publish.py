@@ -0,0 +1,64 @@
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+
+# Blob metadata key holding the canonical hash of the JSON the blob was last published with
+CONTENT_HASH_KEY = 'content-sha256'
+MANIFEST_PREFIX = 'manifests/'
+
+# Hash of the data itself rather than of its serialization, so key order and indentation never count as a change
+def content_hash(data):
+    canonical = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+# Uploads `data` as JSON only when its content hash differs from the stored blob's, and raises if the upload fails.
+# Returns the manifest entry for the blob: its name, hash, generation and whether it changed.
+def publish_json(bucket, name, data, indent=None):
+    digest = content_hash(data)
+    current = bucket.get_blob(name)
+    if current is not None and (current.metadata or {}).get(CONTENT_HASH_KEY) == digest:
+        print(f"{name} unchanged, skipping upload")
+        return {'name': name, 'hash': digest, 'generation': current.generation, 'changed': False}
+
+    blob = bucket.blob(name)
+    blob.metadata = {CONTENT_HASH_KEY: digest}
+    blob.upload_from_string(json.dumps(data, ensure_ascii=False, indent=indent), content_type='application/json')
+    print(f"{name} successfully uploaded to GCS")
+    return {'name': name, 'hash': digest, 'generation': blob.generation, 'changed': True}
+
+# Per-run record of what each scraper published, written next to the data so consumers can invalidate only changed blobs
+class ChangeManifest:
+    def __init__(self):
+        self.started = datetime.now(timezone.utc)
+        self.entries = {}
+        self.sources = {}
+        self._lock = threading.Lock()
+
+    def record(self, source, status, entries=()):
+        with self._lock:
+            self.sources[source] = status
+            for entry in entries:
+                self.entries[entry['name']] = entry
+
+    @property
+    def changed(self):
+        return sorted(name for name, entry in self.entries.items() if entry['changed'])
+
+    def to_dict(self):
+        return {
+            'run_id': self.started.strftime('%Y%m%dT%H%M%SZ'),
+            'started': self.started.isoformat(),
+            'finished': datetime.now(timezone.utc).isoformat(),
+            'changed': self.changed,
+            'blobs': dict(sorted(self.entries.items())),
+            'sources': dict(sorted(self.sources.items())),
+        }
+
+    # Writes manifests/<run_id>.json and overwrites manifests/latest.json with the same content
+    def write(self, bucket):
+        manifest = self.to_dict()
+        text = json.dumps(manifest, ensure_ascii=False, indent=4)
+        for name in (f"{MANIFEST_PREFIX}{manifest['run_id']}.json", f"{MANIFEST_PREFIX}latest.json"):
+            bucket.blob(name).upload_from_string(text, content_type='application/json')
+        return manifest
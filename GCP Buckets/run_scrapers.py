@@ -0,0 +1,153 @@
+import argparse
+import importlib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+
+from http_cache import HTTP_CACHE_DIR, CachingSession
+from publish import ChangeManifest
+
+GCS_BUCKET_NAME = 'beacon-data-bucket'
+
+# Source name (the module in this directory) -> the scrape function it defines
+SCRAPERS = {
+    'asd_guide': 'scrape_and_upload_to_gcs1',
+    'asd_symptoms': 'scrape_and_upload_to_gcs2',
+    'autism_info': 'scrape_and_upload_to_gcs_3',
+    'autism_services_resource_directory': 'scrape_and_upload_to_gcs_4',
+    'autism_spectrum_disorder': 'scrape_and_upload_to_gcs_5',
+    'autism_support': 'scrape_and_upload_to_gcs_6',
+    'birth_to_3_programs': 'scrape_and_upload_to_gcs_7',
+    'calendar_events': 'scrape_and_upload_to_gcs_8',
+    'cdc_autism_data': 'scrape_and_upload_to_gcs_9',
+    'connecticut_resource_directory': 'scrape_and_upload_to_gcs_10',
+    'diaper_connections': 'scrape_and_upload_to_gcs_11',
+    'family_support_and_services': 'scrape_and_upload_to_gcs_12',
+    'milestones': 'scrape_and_upload_to_gcs_13',
+    'nimh_asd': 'scrape_and_upload_to_gcs_14',
+    'signs_autism': 'scrape_and_upload_to_gcs_15',
+    'state_education_resource_center': 'scrape_and_upload_to_gcs_16',
+    'temporary_family_assistance': 'scrape_and_upload_to_gcs_17',
+    'women_infants_children': 'scrape_and_upload_to_gcs_18',
+    'providers': 'scrape_and_upload_to_gcs_19',
+}
+
+# Shared conditional-GET session that allows at most `per_host` requests in flight to any one host
+class HostLimitedSession(CachingSession):
+    def __init__(self, per_host=2, pool_size=32, cache_dir=HTTP_CACHE_DIR):
+        super().__init__(cache_dir)
+        self.per_host = per_host
+        self._limits = {}
+        self._limits_lock = threading.Lock()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def _limit(self, url):
+        host = urlparse(url).hostname or ''
+        with self._limits_lock:
+            limit = self._limits.get(host)
+            if limit is None:
+                limit = self._limits[host] = threading.BoundedSemaphore(self.per_host)
+        return limit
+
+    def request(self, method, url, *args, **kwargs):
+        with self._limit(url):
+            return super().request(method, url, *args, **kwargs)
+
+def load_scraper(source):
+    return getattr(importlib.import_module(source), SCRAPERS[source])
+
+# A source is unchanged when every fetch was answered 304 or the content it published hashed the same as before,
+# and failed when it raised or returned without publishing
+def run_source(source, storage_client, session, manifest):
+    start = time.perf_counter()
+    session.begin()
+    try:
+        published = load_scraper(source)(storage_client=storage_client, session=session)
+    except Exception as e:
+        session.discard()
+        manifest.record(source, 'error')
+        return {'source': source, 'status': 'error', 'seconds': time.perf_counter() - start, 'error': str(e)}
+    fetches = session.fetches()
+    if published is not None:
+        status = 'ok' if published['changed'] else 'unchanged'
+    elif fetches and all(fetch['not_modified'] for fetch in fetches):
+        status = 'unchanged'
+    else:
+        # Returning without publishing anything and without a 304 means the scraper gave up
+        session.discard()
+        manifest.record(source, 'error')
+        return {'source': source, 'status': 'error', 'seconds': time.perf_counter() - start, 'error': 'returned without publishing'}
+    session.commit()
+    manifest.record(source, status, [published] if published else [])
+    return {'source': source, 'status': status, 'seconds': time.perf_counter() - start}
+
+# Runs the selected scrapers concurrently with one storage client and one HTTP session.
+# Returns per-source results and the run's change manifest, which is also written to the bucket unless disabled.
+def run_scrapers(sources=None, workers=None, per_host=2, cache_dir=HTTP_CACHE_DIR, write_manifest=True, storage_client=None, session=None):
+    sources = list(sources or SCRAPERS)
+    unknown = [source for source in sources if source not in SCRAPERS]
+    if unknown:
+        raise ValueError(f"Unknown scrapers: {', '.join(unknown)}")
+
+    if storage_client is None:
+        from gcloud import storage
+        storage_client = storage.Client()
+    session = session or HostLimitedSession(per_host=per_host, cache_dir=cache_dir)
+
+    with ThreadPoolExecutor(max_workers=workers or len(sources), thread_name_prefix='scraper') as executor:
+        manifest = ChangeManifest()
+        futures = [executor.submit(run_source, source, storage_client, session, manifest) for source in sources]
+        results = [future.result() for future in futures]
+
+    if write_manifest:
+        manifest.write(storage_client.get_bucket(GCS_BUCKET_NAME))
+    return results, manifest
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the scrapers in this directory concurrently')
+    parser.add_argument('sources', nargs='*', help='scrapers to run (default: all)')
+    parser.add_argument('--workers', type=int, default=None, help='concurrent scrapers (default: one per source)')
+    parser.add_argument('--per-host', type=int, default=2, help='concurrent requests allowed to any single host')
+    parser.add_argument('--cache-dir', default=HTTP_CACHE_DIR, help='where ETag/Last-Modified validators and bodies are kept')
+    parser.add_argument('--no-http-cache', action='store_true', help='fetch every page in full instead of revalidating')
+    parser.add_argument('--no-manifest', action='store_true', help='do not write the change manifest to the bucket')
+    parser.add_argument('--list', action='store_true', help='list available scrapers and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        print('\n'.join(SCRAPERS))
+        return 0
+
+    start = time.perf_counter()
+    try:
+        results, manifest = run_scrapers(
+            args.sources,
+            workers=args.workers,
+            per_host=args.per_host,
+            cache_dir=None if args.no_http_cache else args.cache_dir,
+            write_manifest=not args.no_manifest,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+
+    print()
+    for result in sorted(results, key=lambda result: result['seconds'], reverse=True):
+        line = f"{result['source']:<36} {result['status']:<9} {result['seconds']:7.2f}s"
+        if result['status'] == 'error':
+            line += f"  {result['error']}"
+        print(line)
+    failed = sum(result['status'] == 'error' for result in results)
+    unchanged = sum(result['status'] == 'unchanged' for result in results)
+    print(f"{len(results)} scrapers in {elapsed:.2f}s ({sum(result['seconds'] for result in results):.2f}s sequential), {unchanged} unchanged, {failed} failed")
+    print(f"changed: {', '.join(manifest.changed) or 'nothing'}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
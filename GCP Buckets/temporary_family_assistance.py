@@ -1,15 +1,20 @@
-def scrape_and_upload_to_gcs_17():
-    import json
+def scrape_and_upload_to_gcs_17(storage_client=None, session=None):
     from bs4 import BeautifulSoup
-    import requests
     from gcloud import storage
-    from google.api_core.exceptions import GoogleAPIError
+    from publish import publish_json
+    from http_cache import CachingSession, not_modified
+    session = session or CachingSession()
 
     # URL of the website to scrape
     URL = 'https://portal.ct.gov/dss/archived-folder/temporary-family-assistance---tfa'
 
     # Send a GET request to the website
-    response = requests.get(URL)
+    response = session.get(URL)
+    if not_modified(response):
+        print(f"{URL} not modified since the last run, skipping")
+        return
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch {URL}: {response.status_code}")
     soup = BeautifulSoup(response.text, 'html.parser')
 
     # Define block to scrape
@@ -26,24 +31,17 @@ def scrape_and_upload_to_gcs_17():
     data = {
         'content': text
     }
-    json_data = json.dumps(data, ensure_ascii=False, indent=4)
 
     # Google Cloud Storage (GCS) configuration
     gcs_bucket_name = 'beacon-data-bucket'
     gcs_file_name = 'temporary_family_assistance.json'
 
     # Initialize Google Cloud Storage client
-    storage_client = storage.Client()
-
-    try:
-        # Upload JSON data to GCS
-        bucket = storage_client.get_bucket(gcs_bucket_name)
-        blob = bucket.blob(gcs_file_name)
-        blob.upload_from_string(json_data, content_type='application/json')
-        print("Data successfully uploaded to GCS")
-    except GoogleAPIError as e:
-        print(f"Failed to upload to GCS: {e}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
-scrape_and_upload_to_gcs_17()
\ No newline at end of file
+    storage_client = storage_client or storage.Client()
+
+    # Upload JSON data to GCS unless it is unchanged since the last run
+    return publish_json(storage_client.get_bucket(gcs_bucket_name), gcs_file_name, data, indent=4)
+
+if __name__ == '__main__':
+    from http_cache import run_standalone
+    run_standalone(scrape_and_upload_to_gcs_17)